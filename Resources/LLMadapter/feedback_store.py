@@ -0,0 +1,132 @@
+import os
+import json
+import hashlib
+import logging
+import datetime
+
+# Local mirror of the reflexive-feedback worksheet.
+# Rows are kept in feedback_rows.jsonl; feedback_meta.json holds the header and a row watermark.
+# Every run archives the worksheet after reading it (move_data_rows), and reset_after_archive then
+# empties the mirror, so the next sync is one full read of the few rows added since. Between
+# archives a sync is a single batched read of the header and the rows past the watermark; it
+# never takes more sheet calls than reading the whole worksheet, only fewer rows.
+
+DEFAULT_STORE_DIR = os.path.join("Output", ".feedback_cache")
+
+def numericise(value):
+    # Same int/float coercion gspread applies in get_all_records
+    if value == "":
+        return value
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+def rows_to_records(header, rows):
+    records = []
+    for row in rows:
+        if not any(cell != "" for cell in row):
+            continue
+        padded = list(row) + [""] * (len(header) - len(row))
+        records.append({k: numericise(v) for k, v in zip(header, padded)})
+    return records
+
+class FeedbackStore:
+    def __init__(self, store_dir):
+        self.store_dir = store_dir
+        self.rows_path = os.path.join(store_dir, "feedback_rows.jsonl")
+        self.meta_path = os.path.join(store_dir, "feedback_meta.json")
+        os.makedirs(store_dir, exist_ok=True)
+
+    @classmethod
+    def for_sheet(cls, sheet_url, worksheet_name, base_dir=None):
+        base_dir = base_dir or os.environ.get("STAR_FEEDBACK_CACHE_DIR", DEFAULT_STORE_DIR)
+        digest = hashlib.sha256(f"{sheet_url}|{worksheet_name}".encode("utf-8")).hexdigest()[:16]
+        return cls(os.path.join(base_dir, digest))
+
+    def load_meta(self):
+        if not os.path.exists(self.meta_path):
+            return None
+        with open(self.meta_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def load_rows(self):
+        rows = []
+        if not os.path.exists(self.rows_path):
+            return rows
+        with open(self.rows_path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    rows.append(json.loads(line))
+        return rows
+
+    def load_records(self):
+        meta = self.load_meta()
+        if meta is None:
+            return None
+        return rows_to_records(meta["header"], self.load_rows())
+
+    def _save_meta(self, header, watermark):
+        meta = {
+            "header": header,
+            "watermark": watermark,
+            "synced_at": datetime.datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        }
+        tmp_path = self.meta_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+        os.replace(tmp_path, self.meta_path)
+
+    def _write_rows(self, rows, mode):
+        with open(self.rows_path, mode, encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+    def full_resync(self, backend, worksheet_name):
+        all_rows = backend.get_all_values(worksheet_name)
+        header = all_rows[0] if all_rows else []
+        data_rows = all_rows[1:]
+        self._write_rows(data_rows, "w")
+        self._save_meta(header, len(data_rows))
+        logging.info(f"Feedback cache full resync: {len(data_rows)} rows from {worksheet_name}")
+        return rows_to_records(header, data_rows)
+
+    def reset_after_archive(self):
+        # The worksheet's data rows were just moved to the archive: mirror an empty sheet
+        meta = self.load_meta()
+        if meta is None:
+            return
+        self._write_rows([], "w")
+        self._save_meta(meta["header"], 0)
+
+    def sync(self, backend, worksheet_name):
+        meta = self.load_meta()
+        if meta is None or not meta["watermark"]:
+            # Nothing mirrored yet, or the sheet was archived since: one full read is cheapest
+            return self.full_resync(backend, worksheet_name)
+        watermark = meta["watermark"]
+        cached_rows = self.load_rows()
+        if len(cached_rows) != watermark:
+            logging.info("Feedback cache inconsistent with watermark; resyncing from scratch.")
+            return self.full_resync(backend, worksheet_name)
+        # The last synced row is re-read with the delta: if it no longer matches, rows were removed
+        # or rewritten (e.g. archived by another machine) and the mirror is rebuilt
+        header, fetched = backend.get_header_and_rows_from(worksheet_name, watermark + 1, len(meta["header"]))
+        if header != meta["header"]:
+            logging.info("Feedback sheet header changed; resyncing from scratch.")
+            return self.full_resync(backend, worksheet_name)
+        anchor = fetched[0] if fetched else []
+        if rows_to_records(header, [anchor]) != rows_to_records(header, [cached_rows[-1]]):
+            logging.info("Feedback sheet rows changed below watermark; resyncing from scratch.")
+            return self.full_resync(backend, worksheet_name)
+        new_rows = fetched[1:]
+        if new_rows:
+            self._write_rows(new_rows, "a")
+        self._save_meta(header, watermark + len(new_rows))
+        logging.info(f"Feedback cache delta sync: {len(new_rows)} new rows, {watermark + len(new_rows)} total")
+        return rows_to_records(header, cached_rows + new_rows)
@@ -0,0 +1,174 @@
+import os
+import time
+import logging
+import datetime
+import threading
+
+# One pooled HTTP client for every outbound call (OpenRouter, Jira, utilities). Connections are
+# kept alive per host, every request has a connect/read timeout, and request / connection counters
+# show how often a call reused a warm connection instead of paying a new TCP+TLS handshake.
+# STAR_HTTP2=1 switches to httpx with HTTP/2 when httpx and h2 are installed.
+
+class HttpxResponse:
+    # The subset of requests.Response the adapter uses, on top of an httpx response
+    def __init__(self, response, elapsed, errors):
+        self._response = response
+        self._errors = errors
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self.elapsed = elapsed
+
+    @property
+    def text(self):
+        with self._errors():
+            self._response.read()
+        return self._response.text
+
+    @property
+    def encoding(self):
+        return self._response.encoding
+
+    @encoding.setter
+    def encoding(self, value):
+        self._response.encoding = value
+
+    def json(self):
+        import json
+        return json.loads(self.text)
+
+    def iter_content(self, chunk_size=None):
+        with self._errors():
+            for chunk in self._response.iter_bytes(chunk_size):
+                yield chunk
+
+    def iter_lines(self, decode_unicode=True):
+        with self._errors():
+            for line in self._response.iter_lines():
+                yield line
+
+    def close(self):
+        self._response.close()
+
+class HttpClient:
+    def __init__(self, pool_hosts=10, pool_size=16, connect_timeout=10.0, read_timeout=60.0, http2=False):
+        self.timeout = (connect_timeout, read_timeout)
+        self.pool_size = pool_size
+        self.requests_by_host = {}
+        self.connections_opened = 0  # httpx only; requests/urllib3 pools keep their own count
+        self._lock = threading.Lock()
+        self.http2 = False
+        if http2:
+            try:
+                import httpx
+                import h2  # noqa: F401  (httpx needs it for HTTP/2)
+                self._httpx = httpx
+                self._client = httpx.Client(
+                    http2=True,
+                    limits=httpx.Limits(max_connections=pool_hosts * pool_size, max_keepalive_connections=pool_size),
+                )
+                self.http2 = True
+            except ImportError:
+                logging.warning("STAR_HTTP2=1 but httpx[http2] is not installed; using HTTP/1.1")
+        if not self.http2:
+            import requests
+            from requests.adapters import HTTPAdapter
+            self.session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_hosts, pool_maxsize=pool_size)
+            self.session.mount("https://", adapter)
+            self.session.mount("http://", adapter)
+            self._adapters = [adapter]
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            pool_hosts=int(os.environ.get("STAR_HTTP_POOL_HOSTS", "10")),
+            pool_size=int(os.environ.get("STAR_HTTP_POOL_SIZE", "16")),
+            connect_timeout=float(os.environ.get("STAR_HTTP_CONNECT_TIMEOUT", "10")),
+            read_timeout=float(os.environ.get("STAR_HTTP_READ_TIMEOUT", "60")),
+            http2=os.environ.get("STAR_HTTP2") == "1",
+        )
+
+    def request(self, method, url, headers=None, data=None, auth=None, timeout=None, stream=False):
+        # Returns a requests.Response (or an HttpxResponse); network errors raise requests exceptions
+        from urllib.parse import urlsplit
+        host = urlsplit(url).netloc
+        with self._lock:
+            self.requests_by_host[host] = self.requests_by_host.get(host, 0) + 1
+        timeout = timeout or self.timeout
+        if not self.http2:
+            return self.session.request(method, url, headers=headers, data=data, auth=auth, timeout=timeout, stream=stream)
+        httpx = self._httpx
+        request = self._client.build_request(
+            method, url, headers=headers, content=data,
+            timeout=httpx.Timeout(timeout[1], connect=timeout[0]),
+            extensions={"trace": self._trace},
+        )
+        started = time.perf_counter()
+        with self._translate_errors():
+            response = self._client.send(request, auth=auth, stream=True)
+        wrapped = HttpxResponse(response, datetime.timedelta(seconds=time.perf_counter() - started), self._translate_errors)
+        if not stream:
+            wrapped.text  # read the body now, like requests does
+            response.close()
+        return wrapped
+
+    def _trace(self, event_name, info):
+        if event_name == "connection.connect_tcp.complete":
+            with self._lock:
+                self.connections_opened += 1
+
+    def _translate_errors(self):
+        # httpx errors surface as the requests exceptions callers already handle
+        from contextlib import contextmanager
+        import requests
+        httpx = self._httpx
+
+        @contextmanager
+        def translate():
+            try:
+                yield
+            except httpx.TimeoutException as e:
+                raise requests.Timeout(str(e)) from e
+            except httpx.HTTPError as e:
+                raise requests.ConnectionError(str(e)) from e
+        return translate()
+
+    def stats(self):
+        with self._lock:
+            by_host = dict(self.requests_by_host)
+            opened = self.connections_opened
+        if not self.http2:
+            opened = 0
+            for adapter in self._adapters:
+                pools = adapter.poolmanager.pools
+                for key in list(pools.keys()):
+                    pool = pools.get(key)
+                    if pool is not None:
+                        opened += pool.num_connections
+        total = sum(by_host.values())
+        return {
+            "protocol": "HTTP/2" if self.http2 else "HTTP/1.1",
+            "requests": total,
+            "requests_by_host": by_host,
+            "connections_opened": opened,
+            "connections_reused": max(total - opened, 0),
+        }
+
+    def close(self):
+        if self.http2:
+            self._client.close()
+        else:
+            self.session.close()
+
+_client = None
+_client_pid = None
+_client_lock = threading.Lock()
+
+def get_http_client():
+    # Process-wide client; a forked worker builds its own instead of sharing the parent's sockets
+    global _client, _client_pid
+    with _client_lock:
+        if _client is None or _client_pid != os.getpid():
+            _client = HttpClient.from_env()
+            _client_pid = os.getpid()
+        return _client
@@ -0,0 +1,248 @@
+import os
+import json
+import time
+import random
+import hashlib
+import logging
+import sqlite3
+import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from http_client import get_http_client
+
+# Bulk Jira updater: a bounded worker pool on the shared keep-alive HTTP client,
+# with retries on 429/5xx that honour Retry-After.
+
+RETRY_STATUS_CODES = {429, 502, 503, 504}
+
+def parse_retry_after(value):
+    # Retry-After is either delta-seconds or an HTTP date
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    from email.utils import parsedate_to_datetime
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def build_rationale_adf(rationale):
+    return {
+        "type": "doc",
+        "version": 1,
+        "content": [
+            {
+                "type": "paragraph",
+                "content": [
+                    {"type": "text", "text": rationale}
+                ]
+            }
+        ]
+    }
+
+class JiraUpdater:
+    def __init__(self, jira_url, jira_user, jira_token, rationale_field, priority_field="priority",
+                 max_workers=8, timeout=(5, 30), max_retries=4, backoff_base=0.5, max_retry_after=60):
+        import requests
+        self.jira_url = jira_url.rstrip("/")
+        self.priority_field = priority_field
+        self.rationale_field = rationale_field
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.max_retry_after = max_retry_after
+        self._request_errors = requests.RequestException
+        self.client = get_http_client()
+        self.auth = (jira_user, jira_token)
+        self.headers = {"Accept": "application/json", "Content-Type": "application/json"}
+        if max_workers > self.client.pool_size:
+            logging.warning("JIRA_MAX_WORKERS=%s exceeds STAR_HTTP_POOL_SIZE=%s; extra connections will not be kept alive",
+                            max_workers, self.client.pool_size)
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            jira_url=os.environ["JIRA_URL"],
+            jira_user=os.environ["JIRA_USER"],
+            jira_token=os.environ["JIRA_TOKEN"],
+            rationale_field=os.environ["JIRA_RATIONALE_FIELD"],
+            priority_field=os.environ.get("JIRA_PRIORITY_FIELD", "priority"),
+            max_workers=int(os.environ.get("JIRA_MAX_WORKERS", "8")),
+            timeout=(float(os.environ.get("JIRA_CONNECT_TIMEOUT", "5")), float(os.environ.get("JIRA_READ_TIMEOUT", "30"))),
+            max_retries=int(os.environ.get("JIRA_MAX_RETRIES", "4")),
+        )
+
+    def close(self):
+        # The HTTP client is shared with the rest of the process; only report on it
+        logging.info("HTTP client after Jira push: %s", self.client.stats())
+
+    def build_payload(self, priority, rationale):
+        return {
+            "fields": {
+                self.priority_field: priority,
+                self.rationale_field: build_rationale_adf(rationale)
+            }
+        }
+
+    def _retry_delay(self, attempt, response=None):
+        if response is not None:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                return min(retry_after, self.max_retry_after)
+        # Full-jitter exponential backoff
+        return random.uniform(0, self.backoff_base * (2 ** attempt))
+
+    def update_issue(self, issue_id, priority, rationale):
+        api_url = f"{self.jira_url}/rest/api/3/issue/{issue_id}"
+        logging.info(f"Jira url to update : {api_url}")
+        payload = self.build_payload(priority, rationale)
+        body = json.dumps(payload)
+        result = {"issue_id": issue_id, "ok": False, "status_code": None, "attempts": 0, "error": ""}
+        for attempt in range(self.max_retries + 1):
+            result["attempts"] = attempt + 1
+            response = None
+            try:
+                response = self.client.request("PUT", api_url, headers=self.headers, data=body, auth=self.auth,
+                                               timeout=self.timeout)
+                result["status_code"] = response.status_code
+                if response.status_code == 204:
+                    result["ok"] = True
+                    result["error"] = ""
+                    logging.info(f"Jira issue {issue_id} updated: priority={priority}, rationale={rationale}")
+                    return result
+                result["error"] = response.text[:500]
+                if response.status_code not in RETRY_STATUS_CODES:
+                    break
+            except self._request_errors as e:
+                result["error"] = str(e)
+            if attempt < self.max_retries:
+                delay = self._retry_delay(attempt, response)
+                logging.warning(f"Retrying Jira {issue_id} in {delay:.2f}s (attempt {attempt + 1}): {result['status_code']} {result['error'][:200]}")
+                time.sleep(delay)
+        logging.error(f"Failed to update Jira {issue_id}: {result['status_code']} {result['error']}")
+        return result
+
+def cards_to_updates(cards):
+    updates = []
+    for card in cards:
+        issue_id = card.get("jira_id") or card.get("jira_key") or card.get("issue_key")
+        priority = card.get("priority_score")
+        rationale = card.get("rationale")
+        if issue_id and priority and rationale:
+            updates.append((issue_id, priority, rationale))
+    return updates
+
+def rationale_hash(rationale):
+    return hashlib.sha256(str(rationale).encode("utf-8")).hexdigest()
+
+class SyncLedger:
+    # Last pushed priority and rationale hash per (Jira instance, issue key), so re-runs only
+    # write issues whose values actually changed.
+    def __init__(self, db_path):
+        self.db_path = db_path
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS jira_sync ("
+            " jira_url TEXT NOT NULL,"
+            " issue_key TEXT NOT NULL,"
+            " priority TEXT NOT NULL,"
+            " rationale_hash TEXT NOT NULL,"
+            " session_id TEXT,"
+            " pushed_at TEXT NOT NULL,"
+            " PRIMARY KEY (jira_url, issue_key))"
+        )
+        self.conn.commit()
+
+    @classmethod
+    def from_env(cls):
+        return cls(os.environ.get("JIRA_SYNC_LEDGER", os.path.join("Output", "jira_sync_ledger.sqlite")))
+
+    def close(self):
+        self.conn.close()
+
+    def filter_changed(self, jira_url, updates):
+        # Split updates into (changed, unchanged) against the last successful push
+        changed, unchanged = [], []
+        for issue_id, priority, rationale in updates:
+            row = self.conn.execute(
+                "SELECT priority, rationale_hash FROM jira_sync WHERE jira_url = ? AND issue_key = ?",
+                (jira_url, issue_id),
+            ).fetchone()
+            if row and row[0] == str(priority) and row[1] == rationale_hash(rationale):
+                unchanged.append((issue_id, priority, rationale))
+            else:
+                changed.append((issue_id, priority, rationale))
+        return changed, unchanged
+
+    def record(self, jira_url, pushed, session_id=None):
+        pushed_at = datetime.datetime.utcnow().isoformat(timespec="seconds") + "Z"
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO jira_sync (jira_url, issue_key, priority, rationale_hash, session_id, pushed_at)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            [(jira_url, issue_id, str(priority), rationale_hash(rationale), session_id, pushed_at)
+             for issue_id, priority, rationale in pushed],
+        )
+        self.conn.commit()
+
+class JiraPush:
+    # Incremental push: cards are submitted one at a time (e.g. while later cards are still
+    # being generated) and updated on the updater's worker pool; finish() waits and summarizes.
+    def __init__(self, updater, ledger=None, session_id=None, force=False):
+        self.updater = updater
+        self.ledger = ledger
+        self.session_id = session_id
+        self.force = force
+        self.started = time.monotonic()
+        self.executor = ThreadPoolExecutor(max_workers=max(updater.max_workers, 1))
+        self.pending = []
+        self.skipped = []
+        self._lock = threading.Lock()
+
+    def submit(self, card):
+        for update in cards_to_updates([card]):
+            with self._lock:
+                if self.ledger and not self.force:
+                    changed, _ = self.ledger.filter_changed(self.updater.jira_url, [update])
+                    if not changed:
+                        self.skipped.append(update[0])
+                        continue
+                self.pending.append((update, self.executor.submit(self.updater.update_issue, *update)))
+
+    def finish(self):
+        results = []
+        try:
+            for update, future in self.pending:
+                try:
+                    results.append((update, future.result()))
+                except Exception as e:
+                    # A worker that blew up counts as a failed update; the others are still recorded
+                    logging.exception("Jira update of %s failed", update[0])
+                    results.append((update, {"issue_id": update[0], "ok": False, "status_code": None,
+                                             "attempts": 0, "error": str(e)}))
+            self.executor.shutdown(wait=True)
+            if self.ledger:
+                with self._lock:
+                    self.ledger.record(self.updater.jira_url, [u for u, r in results if r["ok"]], self.session_id)
+        finally:
+            self.updater.close()
+            if self.ledger:
+                self.ledger.close()
+        summary = {
+            "total": len(results),
+            "succeeded": sum(1 for _, r in results if r["ok"]),
+            "failed": sum(1 for _, r in results if not r["ok"]),
+            "elapsed_seconds": round(time.monotonic() - self.started, 3),
+            "results": [r for _, r in results],
+            "skipped_unchanged": self.skipped,
+        }
+        logging.info("Jira sync: %s succeeded, %s failed, %s unchanged",
+                     summary["succeeded"], summary["failed"], len(self.skipped))
+        return summary
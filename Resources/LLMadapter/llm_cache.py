@@ -0,0 +1,124 @@
+import os
+import json
+import hashlib
+import logging
+import tempfile
+import threading
+
+# Content-addressed on-disk cache for OpenRouter responses.
+# Each entry is <sha256>.json under the cache directory; file mtime doubles as the LRU clock.
+
+DEFAULT_CACHE_DIR = os.path.join("Output", ".llm_cache")
+
+def cache_key(model, messages, params=None):
+    # Hash of model + prompt + request parameters, independent of dict ordering
+    material = json.dumps(
+        {"model": model, "messages": messages, "params": params or {}},
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+class ResponseCache:
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_entries=500, max_bytes=200 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key):
+        path = self._path(key)
+        with self._lock:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                self.misses += 1
+                return None
+            # Touch on read so eviction drops least recently used entries first
+            try:
+                os.utime(path, None)
+            except OSError:
+                pass
+            self.hits += 1
+            return entry
+
+    def put(self, key, entry):
+        # Several processes may write the same key at once: each writes its own temp file and the
+        # last rename wins. The cache is optional, so a failed write is logged and skipped.
+        path = self._path(key)
+        with self._lock:
+            tmp_path = None
+            try:
+                fd, tmp_path = tempfile.mkstemp(prefix=key + ".", suffix=".tmp", dir=self.cache_dir)
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(entry, f)
+                os.replace(tmp_path, path)
+                tmp_path = None
+                self._evict()
+            except OSError as e:
+                logging.warning("LLM cache write for %s failed: %s", key, e)
+            finally:
+                if tmp_path is not None:
+                    try:
+                        os.remove(tmp_path)
+                    except OSError:
+                        pass
+
+    def _evict(self):
+        entries = []
+        total_bytes = 0
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError as e:
+            logging.warning("LLM cache eviction skipped: %s", e)
+            return
+        for name in names:
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+            total_bytes += st.st_size
+        entries.sort()
+        while entries and (
+            (self.max_entries and len(entries) > self.max_entries)
+            or (self.max_bytes and total_bytes > self.max_bytes)
+        ):
+            _, size, path = entries.pop(0)
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total_bytes -= size
+            logging.info("LLM cache evicted %s", os.path.basename(path))
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+def get_response_cache():
+    # Shared cache configured from the environment; None when STAR_LLM_CACHE=0
+    global _response_cache
+    if os.environ.get("STAR_LLM_CACHE", "1") == "0":
+        return None
+    with _response_cache_lock:
+        if _response_cache is None:
+            _response_cache = ResponseCache(
+                cache_dir=os.environ.get("STAR_LLM_CACHE_DIR", DEFAULT_CACHE_DIR),
+                max_entries=int(os.environ.get("STAR_LLM_CACHE_MAX_ENTRIES", "500")),
+                max_bytes=int(float(os.environ.get("STAR_LLM_CACHE_MAX_MB", "200")) * 1024 * 1024),
+            )
+        return _response_cache
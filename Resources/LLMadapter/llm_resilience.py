@@ -0,0 +1,113 @@
+import os
+import time
+import random
+import logging
+import threading
+
+from jira_sync import parse_retry_after
+
+# Retry policy and circuit breakers for OpenRouter calls. Each attempt has its own timeout;
+# retryable failures back off with full jitter (or Retry-After when the server sends it), and a
+# per-model breaker stops sending requests for a while once a model keeps failing.
+
+# 429 and request timeouts are retried; only server-side failures count towards the breaker
+RETRY_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+BREAKER_STATUS_CODES = {500, 502, 503, 504}
+
+class RetryPolicy:
+    def __init__(self, max_retries=3, backoff_base=1.0, backoff_cap=30.0, max_retry_after=120.0,
+                 connect_timeout=10.0, read_timeout=120.0, attempt_timeout=0.0):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.max_retry_after = max_retry_after
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.attempt_timeout = attempt_timeout  # total seconds per attempt (0 = read timeout only)
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            max_retries=int(os.environ.get("OPENROUTER_MAX_RETRIES", "3")),
+            backoff_base=float(os.environ.get("OPENROUTER_BACKOFF_BASE", "1")),
+            backoff_cap=float(os.environ.get("OPENROUTER_BACKOFF_CAP", "30")),
+            max_retry_after=float(os.environ.get("OPENROUTER_MAX_RETRY_AFTER", "120")),
+            connect_timeout=float(os.environ.get("OPENROUTER_CONNECT_TIMEOUT", "10")),
+            read_timeout=float(os.environ.get("OPENROUTER_READ_TIMEOUT", "120")),
+            attempt_timeout=float(os.environ.get("OPENROUTER_ATTEMPT_TIMEOUT", "0")),
+        )
+
+    @property
+    def timeout(self):
+        return (self.connect_timeout, self.read_timeout)
+
+    def delay(self, attempt, retry_after=None):
+        # Retry-After wins when present; otherwise full-jitter exponential backoff
+        seconds = parse_retry_after(retry_after)
+        if seconds is not None:
+            return min(seconds, self.max_retry_after)
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+
+class CircuitBreaker:
+    # closed -> open after failure_threshold consecutive failures; open -> half_open after
+    # reset_timeout, letting one probe through; the probe's outcome closes or reopens it
+    def __init__(self, name, failure_threshold=5, reset_timeout=60.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = "half_open"
+                self.probe_in_flight = False
+            if self.state == "closed":
+                return True
+            if self.state == "half_open" and not self.probe_in_flight:
+                self.probe_in_flight = True
+                return True
+            return False
+
+    def retry_in(self):
+        with self._lock:
+            return max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+
+    def record_success(self):
+        with self._lock:
+            if self.state != "closed":
+                logging.info("Circuit for %s closed", self.name)
+            self.state = "closed"
+            self.failures = 0
+            self.probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                if self.state != "open":
+                    logging.error("Circuit for %s opened after %s consecutive failure(s)", self.name, self.failures)
+                self.state = "open"
+                self.opened_at = time.monotonic()
+                self.probe_in_flight = False
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+def get_circuit_breaker(name):
+    # One breaker per model for the whole process; OPENROUTER_BREAKER_FAILURES=0 disables them
+    threshold = int(os.environ.get("OPENROUTER_BREAKER_FAILURES", "5"))
+    if threshold <= 0:
+        return None
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name, threshold, float(os.environ.get("OPENROUTER_BREAKER_RESET", "60")))
+        return _breakers[name]
+
+def circuit_open(name):
+    breaker = _breakers.get(name)
+    return breaker is not None and breaker.state == "open" and breaker.retry_in() > 0
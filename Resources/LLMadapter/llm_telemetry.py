@@ -0,0 +1,209 @@
+import os
+import sys
+import json
+import argparse
+import datetime
+import threading
+from collections import deque
+
+from stage_metrics import percentile
+
+# Append-only ledger of OpenRouter calls, one JSON object per line, shared by every session:
+# model, HTTP status, token usage, time to first byte / first token, total latency and retries.
+#   python Resources/LLMadapter/llm_telemetry.py                      per-model percentiles
+#   python Resources/LLMadapter/llm_telemetry.py --recent-hours 24    flag regressions vs. earlier calls
+
+DEFAULT_LEDGER_PATH = os.path.join("Output", "llm_telemetry.jsonl")
+
+# Status written for a hedged call abandoned once another call won; such rows carry "cancelled": true
+# and are left out of the latency and success figures
+CANCELLED_STATUS = 499
+
+_ledger_lock = threading.Lock()
+
+def ledger_path():
+    return os.environ.get("STAR_LLM_TELEMETRY", DEFAULT_LEDGER_PATH)
+
+def record_call(entry):
+    # STAR_LLM_TELEMETRY=0 disables the ledger; each entry is written with a single append
+    path = ledger_path()
+    if path == "0":
+        return
+    entry = dict(entry, ts=datetime.datetime.utcnow().isoformat(timespec="milliseconds") + "Z")
+    line = json.dumps(entry, separators=(",", ":")) + "\n"
+    with _ledger_lock:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(line)
+
+# Hedge deadlines only need recent latencies: the last LATENCY_WINDOW successful calls per model
+# are kept in memory and each lookup reads just the lines appended since the previous one. A new
+# process starts from the last LATENCY_TAIL_BYTES of the ledger rather than the whole file.
+LATENCY_WINDOW = 200
+LATENCY_TAIL_BYTES = 4 * 1024 * 1024
+
+class LatencyWindow:
+    def __init__(self, path):
+        self.path = path
+        self.file_id = None
+        self.offset = 0
+        self.by_model = {}
+
+    def refresh(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return
+        skip_partial = False
+        if (st.st_dev, st.st_ino) != self.file_id or st.st_size < self.offset:
+            # New, replaced or truncated ledger: start again from its tail
+            self.file_id = (st.st_dev, st.st_ino)
+            self.by_model = {}
+            self.offset = max(st.st_size - LATENCY_TAIL_BYTES, 0)
+            skip_partial = self.offset > 0
+        if st.st_size == self.offset:
+            return
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            if skip_partial:
+                self.offset += len(f.readline())
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # an append still in progress; read on the next refresh
+                self.offset += len(line)
+                try:
+                    e = json.loads(line)
+                except ValueError:
+                    continue
+                if e.get("status_code") == 200 and not e.get("cancelled") and e.get("latency_seconds") is not None:
+                    self.by_model.setdefault(e.get("model"), deque(maxlen=LATENCY_WINDOW)).append(e["latency_seconds"])
+
+_latency_windows = {}
+
+def latency_percentile(model, pct, min_calls=5):
+    # Latency percentile over the model's last LATENCY_WINDOW successful calls, or None without enough data
+    path = ledger_path()
+    with _ledger_lock:
+        window = _latency_windows.get(path)
+        if window is None:
+            window = _latency_windows[path] = LatencyWindow(path)
+        window.refresh()
+        latencies = list(window.by_model.get(model, ()))
+    if len(latencies) < min_calls:
+        return None
+    return percentile(latencies, pct)
+
+def read_ledger(path):
+    entries = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                continue  # a torn last line from an interrupted write
+    return entries
+
+def parse_ts(ts):
+    return datetime.datetime.strptime(ts.rstrip("Z"), "%Y-%m-%dT%H:%M:%S.%f")
+
+def tokens_per_second(entry):
+    # Completion tokens over generation time (after the first token when streamed)
+    tokens = entry.get("completion_tokens")
+    elapsed = entry.get("latency_seconds") or 0
+    if entry.get("first_token_seconds") is not None:
+        elapsed -= entry["first_token_seconds"]
+    if not tokens or elapsed <= 0:
+        return None
+    return tokens / elapsed
+
+def summarize(entries):
+    cancelled = sum(1 for e in entries if e.get("cancelled"))
+    entries = [e for e in entries if not e.get("cancelled")]
+    ok = [e for e in entries if e.get("status_code") == 200]
+    latencies = [e["latency_seconds"] for e in ok if e.get("latency_seconds") is not None]
+    ttfb = [e["ttfb_seconds"] for e in ok if e.get("ttfb_seconds") is not None]
+    tps = [v for v in (tokens_per_second(e) for e in ok) if v is not None]
+    return {
+        "calls": len(entries),
+        "errors": len(entries) - len(ok),
+        "retries": sum(e.get("retries", 0) for e in entries),
+        "cancelled": cancelled,
+        "latency_p50": percentile(latencies, 50),
+        "latency_p95": percentile(latencies, 95),
+        "latency_p99": percentile(latencies, 99),
+        "ttfb_p50": percentile(ttfb, 50),
+        "tps_p50": percentile(tps, 50),
+        "prompt_tokens": sum(e.get("prompt_tokens") or 0 for e in ok),
+        "completion_tokens": sum(e.get("completion_tokens") or 0 for e in ok),
+    }
+
+def by_model(entries):
+    groups = {}
+    for e in entries:
+        groups.setdefault(e.get("model", "?"), []).append(e)
+    return groups
+
+def find_regressions(recent, baseline, threshold, min_calls):
+    # Compares the recent window against the baseline window; returns human-readable flags
+    if recent["calls"] < min_calls or baseline["calls"] < min_calls:
+        return []
+    flags = []
+    for field in ("latency_p50", "latency_p95", "ttfb_p50"):
+        if recent[field] is not None and baseline[field] and recent[field] > baseline[field] * (1 + threshold):
+            flags.append(f"{field} {baseline[field]:.2f}s -> {recent[field]:.2f}s")
+    if recent["tps_p50"] is not None and baseline["tps_p50"] and recent["tps_p50"] < baseline["tps_p50"] * (1 - threshold):
+        flags.append(f"tokens/s {baseline['tps_p50']:.1f} -> {recent['tps_p50']:.1f}")
+    recent_errors = recent["errors"] / recent["calls"]
+    baseline_errors = baseline["errors"] / baseline["calls"]
+    if recent_errors > baseline_errors + threshold / 2:
+        flags.append(f"error rate {baseline_errors:.0%} -> {recent_errors:.0%}")
+    return flags
+
+def fmt(value, spec):
+    return "-" if value is None else format(value, spec)
+
+def print_report(entries, recent_hours, threshold, min_calls):
+    cutoff = datetime.datetime.utcnow() - datetime.timedelta(hours=recent_hours)
+    print(f"{len(entries)} call(s); regressions compare the last {recent_hours:g}h against everything before")
+    print(f"{'model':<44}{'calls':>7}{'err':>5}{'p50 s':>8}{'p95 s':>8}{'p99 s':>8}{'ttfb s':>8}{'tok/s':>8}")
+    regressed = False
+    for model, group in sorted(by_model(entries).items()):
+        s = summarize(group)
+        print(f"{model:<44}{s['calls']:>7}{s['errors']:>5}{fmt(s['latency_p50'], '.2f'):>8}{fmt(s['latency_p95'], '.2f'):>8}"
+              f"{fmt(s['latency_p99'], '.2f'):>8}{fmt(s['ttfb_p50'], '.2f'):>8}{fmt(s['tps_p50'], '.1f'):>8}")
+        recent = [e for e in group if parse_ts(e["ts"]) >= cutoff]
+        baseline = [e for e in group if parse_ts(e["ts"]) < cutoff]
+        for flag in find_regressions(summarize(recent), summarize(baseline), threshold, min_calls):
+            regressed = True
+            print(f"  REGRESSION {flag}")
+    return regressed
+
+def main():
+    parser = argparse.ArgumentParser(description="Report on the OpenRouter call telemetry ledger")
+    parser.add_argument("--ledger", default=None, help=f"Ledger path (default $STAR_LLM_TELEMETRY or {DEFAULT_LEDGER_PATH})")
+    parser.add_argument("--model", action="append", help="Only report these models")
+    parser.add_argument("--since-days", type=float, default=0, help="Ignore calls older than this many days")
+    parser.add_argument("--recent-hours", type=float, default=24, help="Window compared against earlier calls")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Relative change flagged as a regression")
+    parser.add_argument("--min-calls", type=int, default=5, help="Calls needed in both windows before flagging")
+    parser.add_argument("--json", action="store_true", help="Print per-model summaries as JSON")
+    args = parser.parse_args()
+
+    path = args.ledger or ledger_path()
+    if not os.path.exists(path):
+        print(f"No telemetry ledger at {path}")
+        sys.exit(1)
+    entries = read_ledger(path)
+    if args.model:
+        entries = [e for e in entries if e.get("model") in args.model]
+    if args.since_days:
+        since = datetime.datetime.utcnow() - datetime.timedelta(days=args.since_days)
+        entries = [e for e in entries if parse_ts(e["ts"]) >= since]
+    if args.json:
+        print(json.dumps({model: summarize(group) for model, group in sorted(by_model(entries).items())}, indent=2))
+        return
+    # Exit status 2 when a regression is flagged, so the report can gate scheduled checks
+    sys.exit(2 if print_report(entries, args.recent_hours, args.threshold, args.min_calls) else 0)
+
+if __name__ == "__main__":
+    main()
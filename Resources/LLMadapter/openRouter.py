@@ -1,87 +1,120 @@
 import sys
 import os
-import requests
 import json
 import logging
 import datetime
-import gspread
-from google.oauth2.service_account import Credentials
-from dotenv import load_dotenv
+import threading
+import time
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from llm_cache import cache_key, get_response_cache
+from jira_sync import JiraPush, JiraUpdater, SyncLedger
+from sheet_backend import GspreadBackend, move_rows
+from feedback_store import FeedbackStore
+from prompt_builder import build_prompt
+from stream_parser import DecisionCardStream, StreamError, iter_sse_content
+from stage_metrics import StageMetrics, file_size
+from llm_telemetry import CANCELLED_STATUS, latency_percentile, record_call
+from http_client import get_http_client
+from llm_resilience import BREAKER_STATUS_CODES, RETRY_STATUS_CODES, RetryPolicy, circuit_open, get_circuit_breaker
 
-load_dotenv()
+_env_loaded = False
+
+def load_env():
+    # .env is read on first use instead of at import time, so importing this module stays cheap
+    global _env_loaded
+    if not _env_loaded:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _env_loaded = True
 
 def get_reflexive_feedback(sheet_url, worksheet_name):
-    google_creds_json = os.environ.get("GOOGLE_CLOUD_CREDS_JSON")
-    if not google_creds_json:
-        logging.error("Missing GOOGLE_CLOUD_CREDS_JSON environment variable.")
-        raise RuntimeError("Missing GOOGLE_CLOUD_CREDS_JSON environment variable")
+    # Served from the local feedback mirror; only rows added since the last run are fetched.
+    # STAR_FEEDBACK_OFFLINE=1 skips Google Sheets entirely and uses the cached copy.
+    load_env()
+    store = FeedbackStore.for_sheet(sheet_url, worksheet_name)
+    if os.environ.get("STAR_FEEDBACK_OFFLINE") == "1":
+        feedback = store.load_records()
+        if feedback is None:
+            raise RuntimeError(f"No cached feedback for {worksheet_name} in {sheet_url}")
+        logging.info(f"Offline mode: using {len(feedback)} cached feedback records.")
+        return feedback
     try:
-        creds_dict = json.loads(google_creds_json)
-        scopes = ["https://www.googleapis.com/auth/spreadsheets.readonly"]
-        credentials = Credentials.from_service_account_info(creds_dict, scopes=scopes)
-        gc = gspread.authorize(credentials)
-        sh = gc.open_by_url(sheet_url)
+        backend = GspreadBackend.from_env(sheet_url, scopes=("https://www.googleapis.com/auth/spreadsheets.readonly",))
         logging.info(f"Connected to Google Sheet: {sheet_url}")
-        worksheet = sh.worksheet(worksheet_name)
-        logging.info(f"Accessed worksheet: {worksheet_name}")
-        feedback = worksheet.get_all_records()
-        logging.info(f"Retrieved {len(feedback)} feedback records from Google Sheet.")
+        feedback = store.sync(backend, worksheet_name)
+        logging.info(f"Retrieved {len(feedback)} feedback records from Google Sheet ({backend.calls} API calls).")
         return feedback
-    except gspread.exceptions.APIError as e:
-        logging.error(f"Google Sheets API error: {e}")
-        raise
-    except gspread.exceptions.WorksheetNotFound as e:
-        logging.error(f"Worksheet not found: {worksheet_name} in {sheet_url}: {e}")
-        raise
     except Exception as e:
-        logging.error(f"General error accessing Google Sheets: {e}")
-        raise
+        logging.error(f"Error accessing Google Sheets: {e}")
+        feedback = store.load_records()
+        if feedback is None:
+            raise
+        logging.warning(f"Falling back to {len(feedback)} cached feedback records.")
+        return feedback
 
-def send_openrouter_request(features_path, session_folder, feedback_json):
-    # Ensure session folder exists
-    os.makedirs(session_folder, exist_ok=True)
-    api_key = os.environ.get("OPENROUTER_API_KEY")
-    site_url = "test1"
-    site_name = "test1"
-    url = "https://openrouter.ai/api/v1/chat/completions"
-
-    # REQUIRED fields (no issue_id, includes biases)
-    required_fields = [
-        "issue_key",
-        "summary",
-        "description",
-        "value_agreement",
-        "dissent",
-        "dependencies",
-        "biases"
-    ]
+OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
+OPENROUTER_MODEL = "nvidia/nemotron-nano-12b-v2-vl:free"
+RESULT_JSON_RELPATH = os.path.join("llm_eval_output", "star_decision_cards_full.json")
+
+FEEDBACK_SHEET_URL = "https://docs.google.com/spreadsheets/d/1XMgrnVNwMaQ_o2QSLVyAWC59TKhPvqr2_z9Z75h_1x4"
+FEEDBACK_WORKSHEET = "Sheet1"
+ARCHIVE_WORKSHEET = "Sheet2"
 
+# REQUIRED fields (no issue_id, includes biases)
+REQUIRED_FIELDS = [
+    "issue_key",
+    "summary",
+    "description",
+    "value_agreement",
+    "dissent",
+    "dependencies",
+    "biases"
+]
+
+def load_features(features_path):
     with open(features_path, 'r', encoding='utf-8') as file:
         all_features = json.load(file)
     if isinstance(all_features, dict):
         all_features = [all_features]
-    filtered_features = [
-        {k: feature.get(k, "") for k in required_fields}
-        for feature in all_features
-    ]
+    return all_features
 
-    json_string = json.dumps(filtered_features, indent=2)
-
-    prompt_content = (
-        "Analyze the following list of feature metadata (in JSON). For each feature, generate a decision card "
-        "including all input fields, a priority score (1-10), and a rationale. Use only the inputs provided in "
-        "the JSON file to determine priority, do not invent anything on your own. "
-        "Additionally, study the following reflexive feedback from previous issue releases, "
-        "the deviations in prioritization, and post-release feedback, and incorporate this analysis into your final priority evaluation. "
-        "Try to avoid assigning the same priority to more than one feature. Return the output in JSON array format, "
-        "with each 'decision_card' json object containing jira id, summary, value agreement, dissent, dependencies, biases, "
-        "a priority_score, and a rationale. "
-        "Do not return anything else.\n"
-        "Reflexive_Feedback_JSON:\n"
-        f"{feedback_json}\n"
-        "Features_JSON:\n"
-        f"{json_string}"
-    )
+def chunk_features(features, batch_size=0, max_chars=0):
+    # Split into batches bounded by feature count and serialized size (0 disables a bound)
+    if not batch_size and not max_chars:
+        return [features] if features else []
+    batches = []
+    current = []
+    current_chars = 0
+    for feature in features:
+        feature_chars = len(json.dumps(feature))
+        if current and (
+            (batch_size and len(current) >= batch_size)
+            or (max_chars and current_chars + feature_chars > max_chars)
+        ):
+            batches.append(current)
+            current = []
+            current_chars = 0
+        current.append(feature)
+        current_chars += feature_chars
+    if current:
+        batches.append(current)
+    return batches
+
+def request_decision_cards(prompt_content, api_exchange_filename, on_card=None, cache_read=True, metrics=None,
+                           model=None, cancel=None):
+    # Send one prompt to OpenRouter and return the parsed decision cards, or None on failure.
+    # on_card is called for every card as soon as it is available; with OPENROUTER_STREAM=1 that
+    # is while the completion is still being generated. Setting the cancel event abandons the
+    # request (the hedged requests below use it to stop the losers): the body stops being read,
+    # and an answer that arrives anyway is dropped before metrics, the cache or the exchange file.
+    # 429/5xx and network errors are retried; see send_completion.
+    load_env()
+    stream = os.environ.get("OPENROUTER_STREAM") == "1"
+    api_key = os.environ.get("OPENROUTER_API_KEY")
+    site_url = "test1"
+    site_name = "test1"
+    url = os.environ.get("OPENROUTER_URL", OPENROUTER_URL)
 
     headers = {
         "Authorization": f"Bearer {api_key}",
@@ -91,7 +124,7 @@ def send_openrouter_request(features_path, session_folder, feedback_json):
     }
 
     payload = {
-        "model": "nvidia/nemotron-nano-12b-v2-vl:free",
+        "model": model or OPENROUTER_MODEL,
         "messages": [
             {
                 "role": "user",
@@ -99,15 +132,56 @@ def send_openrouter_request(features_path, session_folder, feedback_json):
             }
         ]
     }
+    if stream:
+        payload["stream"] = True
 
     logging.info("Request URL: %s", url)
     logging.info("Request Headers: %s", headers)
     logging.info("Request Body: %s", json.dumps(payload, indent=2))
 
-    api_exchange_filename = os.path.join(session_folder, 'api_exchange.json')
-    response = requests.post(url, headers=headers, data=json.dumps(payload))
-    logging.info("Response Status Code: %s", response.status_code)
-    logging.info("Response Headers: %s", dict(response.headers))
+    # Identical model + prompt + parameters are served from the on-disk response cache
+    cache = get_response_cache()
+    call_started = time.perf_counter()
+    key = cache_key(payload["model"], payload["messages"], {k: v for k, v in payload.items() if k not in ("model", "messages", "stream")})
+    cached = cache.get(key) if cache and cache_read else None
+    streamed = None
+    # Every network call goes to the telemetry ledger (see llm_telemetry.py); cache hits do not
+    telemetry = {
+        "model": payload["model"],
+        "session": os.path.basename(os.path.dirname(os.path.abspath(api_exchange_filename))),
+        "exchange": os.path.basename(api_exchange_filename),
+        "stream": stream,
+        "prompt_chars": len(prompt_content),
+        "status_code": None,
+        "ttfb_seconds": None,
+        "first_token_seconds": None,
+        "latency_seconds": None,
+        "retries": 0,
+    }
+    if cached is not None:
+        logging.info("LLM cache hit: %s", key)
+        status_code = cached["status_code"]
+        response_headers = cached["headers"]
+        response_text = cached["body"]
+    else:
+        status_code, response_headers, response_text, streamed = send_completion(
+            url, headers, payload, on_card, cancel, telemetry, call_started)
+        if cancel is not None and cancel.is_set():
+            telemetry["cancelled"] = True  # e.g. stalled before the first byte and answered after the winner
+        # A hedge loser cut off mid-response is logged as 499 (client closed request), not as a success
+        telemetry["status_code"] = CANCELLED_STATUS if telemetry.get("cancelled") else status_code
+        telemetry["latency_seconds"] = round(time.perf_counter() - call_started, 4)
+        telemetry.update(response_usage(response_text) if telemetry["status_code"] == 200 else {})
+        record_call(telemetry)
+        if telemetry.get("cancelled"):
+            logging.info("Cancelled %s request for %s", payload["model"], os.path.basename(api_exchange_filename))
+            return None
+    if cache:
+        logging.info("LLM cache stats: %s", cache.stats())
+    if metrics:
+        metrics.add("llm_call", time.perf_counter() - call_started, nbytes=len(response_text.encode("utf-8")))
+    logging.info("Response Status Code: %s", status_code)
+    logging.info("Response Headers: %s", response_headers)
 
     api_exchange_data = {
         "request": {
@@ -116,9 +190,11 @@ def send_openrouter_request(features_path, session_folder, feedback_json):
             "payload": payload,
         },
         "response": {
-            "status_code": response.status_code,
-            "headers": dict(response.headers),
-            "body": response.text,
+            "status_code": status_code,
+            "headers": response_headers,
+            "body": response_text,
+            "from_cache": cached is not None,
+            "cache_key": key,
         }
     }
 
@@ -126,135 +202,483 @@ def send_openrouter_request(features_path, session_folder, feedback_json):
         json.dump(api_exchange_data, fx, indent=2)
 
     # handle non‑200 responses
-    if response.status_code != 200:
-        logging.error("API request failed with status code %s", response.status_code)
-        logging.error("Response Body: %s", response.text)
-        print(f"API request failed with status code {response.status_code}. Check log for details.")
-        return ""
+    if status_code != 200:
+        logging.error("API request failed with status code %s", status_code)
+        logging.error("Response Body: %s", response_text)
+        if status_code is None:
+            print(f"API request failed: {response_text}. Check log for details.")
+        else:
+            print(f"API request failed with status code {status_code}. Check log for details.")
+        return None
+
+    if streamed is not None:
+        if streamed.errors:
+            logging.warning("Streamed response contained %s malformed card(s)", len(streamed.errors))
+        decision_cards = streamed.cards
+    else:
+        decision_cards = parse_completion(response_text, on_card)
+    # Only answers that parsed into cards are cached, so a bad answer is asked again next run
+    if cache and cached is None and decision_cards:
+        cache.put(key, {"status_code": status_code, "headers": response_headers, "body": response_text})
+    return decision_cards
 
+def parse_completion(response_text, on_card=None):
+    # Decision cards from a non-streamed completion body, or None when it holds no card array
     try:
-        resp_data = response.json()
+        resp_data = json.loads(response_text)
         logging.info("Response Body: %s", json.dumps(resp_data, indent=2))
         assistant_content = resp_data['choices'][0]['message']['content']
 
-        # Extract JSON array from assistant_content
-        json_start = assistant_content.find('[')
-        json_end = assistant_content.rfind(']') + 1
-        cards_json_str = assistant_content[json_start:json_end]
-        decision_cards = json.loads(cards_json_str)
-
-        # Merge with original workshop feature set (consolidated reasoning)
-        with open(features_path, 'r', encoding='utf-8') as file:
-            all_features = json.load(file)
-        if isinstance(all_features, dict):
-            all_features = [all_features]
-        features_lookup = {f["issue_key"]: f for f in all_features if "issue_key" in f}
-
-        merged_cards = []
-        for card in decision_cards:
-            issue_key = card.get("jira_key") or card.get("issue_key")
-            base_feature = features_lookup.get(issue_key, {})
-            merged = base_feature.copy()  # Start with all original fields (including biases)
-            merged.update(card)           # Add/overwrite with LLM fields (including biases if present in LLM output)
-            merged_cards.append(merged)
-
-        # Save the merged output
-        result_json_filename = os.path.join(session_folder, "llm_eval_output/star_decision_cards_full.json")
-        os.makedirs(os.path.dirname(result_json_filename), exist_ok=True)
-        with open(result_json_filename, "w", encoding='utf-8') as f:
-            json.dump(merged_cards, f, indent=2)
+        # Tolerant extraction of the JSON array: broken objects are skipped, not fatal
+        parsed = DecisionCardStream()
+        decision_cards = parsed.feed(assistant_content)
+        if not parsed.started:
+            raise ValueError("No JSON array found in assistant content")
+        if parsed.errors:
+            logging.warning("Response contained %s malformed card(s)", len(parsed.errors))
+        if on_card:
+            for card in decision_cards:
+                on_card(card)
+        return decision_cards
+    except Exception as e:
+        logging.error("Error processing response: %s", str(e))
+        print("Failed to process API response. Check log for details.")
+        return None
+
+def post_completion(url, headers, payload, on_card, cancel, telemetry, call_started, policy):
+    # One HTTP attempt. Returns (status_code, headers, body, streamed); network errors and
+    # timeouts raise. A streamed body is stored like a non-streamed completion.
+    import requests
+    attempt_started = time.monotonic()
+    response = get_http_client().request("POST", url, headers=headers, data=json.dumps(payload),
+                                         stream=bool(payload.get("stream")) or cancel is not None,
+                                         timeout=policy.timeout)
+    response_headers = dict(response.headers)
+    telemetry["ttfb_seconds"] = round(response.elapsed.total_seconds(), 4)
+    if not payload.get("stream") or response.status_code != 200:
+        if cancel is None:
+            return response.status_code, response_headers, response.text, None
+        return response.status_code, response_headers, read_body(response, cancel, telemetry), None
+    response.encoding = "utf-8"
+    streamed = DecisionCardStream()
+    content_parts = []
+    usage = {}
+    try:
+        for delta in iter_sse_content(response.iter_lines(decode_unicode=True), usage):
+            if cancel is not None and cancel.is_set():
+                telemetry["cancelled"] = True
+                break
+            if policy.attempt_timeout and time.monotonic() - attempt_started > policy.attempt_timeout:
+                raise requests.Timeout(f"stream exceeded the {policy.attempt_timeout:g}s attempt timeout")
+            if telemetry["first_token_seconds"] is None:
+                telemetry["first_token_seconds"] = round(time.perf_counter() - call_started, 4)
+            content_parts.append(delta)
+            for card in streamed.feed(delta):
+                if on_card:
+                    on_card(card)
+    finally:
+        response.close()
+    if streamed.started and not streamed.finished and not telemetry.get("cancelled"):
+        # The connection closed cleanly but the card array never did: retry like a dropped connection
+        raise requests.ConnectionError("stream ended before the decision card array was closed")
+    completion = {"choices": [{"message": {"role": "assistant", "content": "".join(content_parts)}}]}
+    if usage:
+        completion["usage"] = usage
+    return response.status_code, response_headers, json.dumps(completion), streamed
+
+def read_body(response, cancel, telemetry):
+    # Non-streamed body read in chunks, so a cancelled request drops its connection instead of
+    # downloading the rest of an answer nobody will use
+    parts = []
+    try:
+        for chunk in response.iter_content(chunk_size=16384):
+            if cancel.is_set():
+                telemetry["cancelled"] = True
+                break
+            parts.append(chunk)
+    finally:
+        response.close()
+    return b"".join(parts).decode(response.encoding or "utf-8", errors="replace")
+
+def send_completion(url, headers, payload, on_card, cancel, telemetry, call_started):
+    # post_completion with retries (jittered backoff, Retry-After) behind the model's circuit
+    # breaker. Never raises: a request that could not be made returns status None and the reason.
+    import requests
+    policy = RetryPolicy.from_env()
+    breaker = get_circuit_breaker(payload["model"])
+    for attempt in range(policy.max_retries + 1):
+        telemetry["retries"] = attempt
+        if breaker and not breaker.allow():
+            message = f"Circuit open for {payload['model']}; retry in {breaker.retry_in():.0f}s"
+            logging.error(message)
+            telemetry["error"] = "circuit open"
+            return None, {}, message, None
+        retry_after = None
+        try:
+            status_code, response_headers, response_text, streamed = post_completion(
+                url, headers, payload, on_card, cancel, telemetry, call_started, policy)
+            error = f"HTTP {status_code}"
+            retry_after = next((v for k, v in response_headers.items() if k.lower() == "retry-after"), None)
+            failed = status_code in BREAKER_STATUS_CODES
+            retryable = status_code in RETRY_STATUS_CODES
+        except (requests.RequestException, StreamError) as e:
+            status_code, response_headers, response_text, streamed = None, {}, f"{type(e).__name__}: {e}", None
+            error = response_text
+            failed = True
+            retryable = True
+        except Exception as e:
+            # Anything else still counts against the breaker (a half-open probe must not stay
+            # in flight forever) but is not retried
+            logging.exception("OpenRouter %s request failed", payload["model"])
+            status_code, response_headers, response_text, streamed = None, {}, f"{type(e).__name__}: {e}", None
+            error = response_text
+            failed = True
+            retryable = False
+        if breaker:
+            if failed:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+        if not retryable or telemetry.get("cancelled") or (cancel is not None and cancel.is_set()):
+            break
+        if attempt < policy.max_retries:
+            delay = policy.delay(attempt, retry_after)
+            logging.warning("OpenRouter %s failed (%s); retry %s/%s in %.2fs",
+                            payload["model"], error, attempt + 1, policy.max_retries, delay)
+            if cancel is not None:
+                if cancel.wait(delay):
+                    break
+            else:
+                time.sleep(delay)
+    if status_code is None:
+        telemetry["error"] = response_text
+    return status_code, response_headers, response_text, streamed
+
+def response_usage(response_text):
+    # Token counts from the completion's usage block, when the provider sent one
+    try:
+        usage = json.loads(response_text).get("usage") or {}
+    except (ValueError, AttributeError):
+        return {}
+    return {k: usage[k] for k in ("prompt_tokens", "completion_tokens", "total_tokens") if k in usage}
+
+def hedge_models():
+    # OPENROUTER_HEDGE_MODELS: comma-separated fallback models; empty disables hedging
+    return [m.strip() for m in os.environ.get("OPENROUTER_HEDGE_MODELS", "").split(",") if m.strip()]
+
+def hedge_delay(model):
+    # OPENROUTER_HEDGE_AFTER is either seconds ("20") or a latency percentile of the model's past
+    # calls from the telemetry ledger ("p90"); OPENROUTER_HEDGE_DEFAULT_SECONDS covers a cold ledger
+    setting = os.environ.get("OPENROUTER_HEDGE_AFTER", "p95").strip().lower()
+    default = float(os.environ.get("OPENROUTER_HEDGE_DEFAULT_SECONDS", "30"))
+    if setting.startswith("p"):
+        value = latency_percentile(model, float(setting[1:]))
+        return default if value is None else value
+    return float(setting)
+
+def hedged_decision_cards(prompt_content, api_exchange_filename, expected_keys, on_card=None, cache_read=True, metrics=None):
+    # Send the prompt to OPENROUTER_MODEL; whenever the newest request has not answered within
+    # hedge_delay(), or as soon as one fails, send the same prompt to the next fallback model.
+    # The first response with at least one valid card wins and the rest are cancelled. Cards are
+    # handed to on_card only once a winner is known, so hedged batches do not stream.
+    models = [OPENROUTER_MODEL] + hedge_models()
+    delay = hedge_delay(OPENROUTER_MODEL)
+    results = queue.Queue()
+    cancel = threading.Event()
+
+    def attempt(index, model):
+        if index == 0:
+            exchange_filename = api_exchange_filename
+        else:
+            exchange_filename = api_exchange_filename[:-len(".json")] + f"_hedge{index}.json"
+        try:
+            cards = request_decision_cards(prompt_content, exchange_filename, None, cache_read, metrics, model, cancel)
+        except Exception as e:
+            logging.error("Hedged request to %s failed: %s", model, e)
+            cards = None
+        results.put((index, model, cards))
+
+    def launch(index):
+        threading.Thread(target=attempt, args=(index, models[index]), daemon=True).start()
+
+    launch(0)
+    launched, pending = 1, 1
+    deadline = time.monotonic() + delay
+    while pending:
+        try:
+            timeout = max(deadline - time.monotonic(), 0) if launched < len(models) else None
+            index, model, cards = results.get(timeout=timeout)
+        except queue.Empty:
+            logging.warning("No answer after %.1fs; hedging with %s", delay, models[launched])
+            launch(launched)
+            launched, pending = launched + 1, pending + 1
+            deadline = time.monotonic() + delay
+            continue
+        pending -= 1
+        if cards and any(card_problem(card, expected_keys) is None for card in cards):
+            cancel.set()
+            if index:
+                logging.warning("Hedged request won by %s (fallback %s)", model, index)
+            if on_card:
+                for card in cards:
+                    on_card(card)
+            return cards
+        logging.warning("No usable decision cards from %s", model)
+        if launched < len(models):
+            launch(launched)
+            launched, pending = launched + 1, pending + 1
+            deadline = time.monotonic() + delay
+    return None
+
+def parse_feedback(feedback_json):
+    # Accepts the feedback records themselves or their JSON serialization
+    if isinstance(feedback_json, str):
+        try:
+            feedback_json = json.loads(feedback_json) if feedback_json.strip() else []
+        except ValueError:
+            logging.warning("Reflexive feedback is not valid JSON; sending it as a single note.")
+            return [{"note": feedback_json}]
+    if isinstance(feedback_json, dict):
+        feedback_json = [feedback_json]
+    return list(feedback_json or [])
+
+def card_issue_key(card):
+    return card.get("jira_key") or card.get("issue_key") or card.get("jira_id")
+
+def card_problem(card, expected_keys):
+    # Why a card cannot be used, or None when it is valid for this request
+    if card_issue_key(card) not in expected_keys:
+        return f"unexpected issue key {card_issue_key(card)!r}"
+    try:
+        priority = float(card.get("priority_score"))
+    except (TypeError, ValueError):
+        return "missing or non-numeric priority_score"
+    if not 1 <= priority <= 10:
+        return f"priority_score {priority} out of range"
+    rationale = card.get("rationale")
+    if not isinstance(rationale, str) or not rationale.strip():
+        return "missing rationale"
+    return None
+
+def evaluate_batches(batches, feedback_records, session_folder, max_workers=1, on_card=None, metrics=None):
+    # Run one LLM request per batch, at most max_workers at a time; results keep batch order.
+    # Each batch result is (valid_cards, missing_keys): features whose card was missing or invalid
+    # are re-requested on their own, up to OPENROUTER_REPAIR_ATTEMPTS times.
+    repair_attempts = int(os.environ.get("OPENROUTER_REPAIR_ATTEMPTS", "2"))
+    metrics = metrics or StageMetrics()
+
+    def run_batch(index):
+        if len(batches) == 1:
+            exchange_prefix = "api_exchange"
+        else:
+            exchange_prefix = f"api_exchange_batch{index + 1:03d}"
+        pending = batches[index]
+        valid_cards = {}
+        lock = threading.Lock()
+
+        def accept(card, expected_keys):
+            problem = card_problem(card, expected_keys)
+            key = card_issue_key(card)
+            with lock:
+                if problem or key in valid_cards:
+                    if problem:
+                        logging.warning("Rejected decision card in batch %s: %s", index + 1, problem)
+                    return
+                valid_cards[key] = card
+            if on_card:
+                on_card(card)
+
+        for attempt in range(repair_attempts + 1):
+            expected_keys = {f["issue_key"] for f in pending}
+            if attempt == 0:
+                logging.info("Submitting batch %s/%s with %s features", index + 1, len(batches), len(pending))
+                exchange_name = f"{exchange_prefix}.json"
+            else:
+                logging.info("Re-requesting %s missing/invalid card(s) for batch %s (attempt %s)", len(pending), index + 1, attempt)
+                exchange_name = f"{exchange_prefix}_repair{attempt}.json"
+            with metrics.stage("prompt_build") as rec:
+                prompt_content, _ = build_prompt(feedback_records, pending, OPENROUTER_MODEL)
+                rec.items = len(pending)
+                rec.bytes = len(prompt_content.encode("utf-8"))
+            if hedge_models():
+                cards = hedged_decision_cards(
+                    prompt_content,
+                    os.path.join(session_folder, exchange_name),
+                    expected_keys,
+                    lambda card: accept(card, expected_keys),
+                    cache_read=(attempt == 0),
+                    metrics=metrics,
+                )
+            else:
+                cards = request_decision_cards(
+                    prompt_content,
+                    os.path.join(session_folder, exchange_name),
+                    lambda card: accept(card, expected_keys),
+                    cache_read=(attempt == 0),
+                    metrics=metrics,
+                )
+            metrics.count("llm_call", items=len(cards or []))
+            pending = [f for f in pending if f["issue_key"] not in valid_cards]
+            if not pending:
+                break
+            if cards is None and all(circuit_open(m) for m in [OPENROUTER_MODEL] + hedge_models()):
+                logging.error("Skipping repairs for batch %s: every model's circuit is open", index + 1)
+                break
+
+        ordered = [valid_cards[f["issue_key"]] for f in batches[index] if f["issue_key"] in valid_cards]
+        return ordered, [f["issue_key"] for f in pending]
+
+    if len(batches) <= 1 or max_workers <= 1:
+        return [run_batch(i) for i in range(len(batches))]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(batches))) as pool:
+        return list(pool.map(run_batch, range(len(batches))))
+
+def merge_card(card, features_lookup):
+    issue_key = card_issue_key(card)
+    base_feature = features_lookup.get(issue_key, {})
+    merged = base_feature.copy()  # Start with all original fields (including biases)
+    merged.update(card)           # Add/overwrite with LLM fields (including biases if present in LLM output)
+    return merged
+
+def send_openrouter_request(features_path, session_folder, feedback_json):
+    merged_cards = evaluate_features(load_features(features_path), session_folder, feedback_json)
+    if not merged_cards:
+        return ""
+    return os.path.join(session_folder, RESULT_JSON_RELPATH)
+
+def evaluate_features(all_features, session_folder, feedback_json, metrics=None, push_jira=True):
+    # In-memory entry point: workshop records in, merged decision cards out.
+    # star_decision_cards_full.json and the other session files are written as artifacts.
+    # prompt_build, llm_call, merge and jira_push timings are recorded on metrics when given.
+    # push_jira=False leaves Jira alone even when it is configured in the environment or .env.
+    load_env()
+    # Ensure session folder exists
+    os.makedirs(session_folder, exist_ok=True)
+    metrics = metrics or StageMetrics()
+
+    if isinstance(all_features, dict):
+        all_features = [all_features]
+    filtered_features = [
+        {k: feature.get(k, "") for k in REQUIRED_FIELDS}
+        for feature in all_features
+    ]
+
+    # Batched mode: OPENROUTER_BATCH_SIZE / OPENROUTER_BATCH_MAX_CHARS bound each request,
+    # OPENROUTER_MAX_WORKERS bounds how many batches are in flight at once
+    batch_size = int(os.environ.get("OPENROUTER_BATCH_SIZE", "0"))
+    batch_max_chars = int(os.environ.get("OPENROUTER_BATCH_MAX_CHARS", "0"))
+    max_workers = int(os.environ.get("OPENROUTER_MAX_WORKERS", "4"))
+    batches = chunk_features(filtered_features, batch_size, batch_max_chars)
+    logging.info("Evaluating %s features in %s batch(es), max_workers=%s", len(filtered_features), len(batches), max_workers)
+
+    # Each card is merged, appended to the stream file and queued for Jira as soon as it arrives,
+    # so downstream consumers can start on early cards while later ones are still generating
+    features_lookup = {f["issue_key"]: f for f in all_features if "issue_key" in f}
+    stream_filename = os.path.join(session_folder, "llm_eval_output/star_decision_cards_stream.jsonl")
+    os.makedirs(os.path.dirname(stream_filename), exist_ok=True)
+    jira_push = start_jira_push(session_folder) if push_jira else None
+    stream_lock = threading.Lock()
+
+    with open(stream_filename, "w", encoding='utf-8') as stream_file:
+        def on_card(card):
+            merged = merge_card(card, features_lookup)
+            with stream_lock:
+                stream_file.write(json.dumps(merged) + "\n")
+                stream_file.flush()
+            if jira_push:
+                jira_push.submit(merged)
+
+        try:
+            batch_results = evaluate_batches(batches, parse_feedback(feedback_json), session_folder, max_workers, on_card, metrics)
+        finally:
+            # Update Jira with the results over a pooled, concurrent session. Updates run while
+            # cards stream in; jira_push measures only the wait for the ones still outstanding.
+            if jira_push:
+                with metrics.stage("jira_push") as rec:
+                    rec.items = finish_jira_push(jira_push, session_folder)["total"]
+    cache = get_response_cache()
+    if cache:
+        stats = cache.stats()
+        print(f"LLM cache: {stats['hits']} hit(s), {stats['misses']} miss(es)")
+    logging.info("HTTP client: %s", get_http_client().stats())
+    decision_cards = [card for cards, _ in batch_results for card in cards]
+    missing_keys = [key for _, missing in batch_results for key in missing]
+    if not decision_cards:
+        logging.error("No valid decision cards returned; nothing written.")
+        return []
+    if missing_keys:
+        logging.error("No valid decision card after repair for: %s", ", ".join(missing_keys))
+        print(f"Missing decision cards for {len(missing_keys)} feature(s). Check log for details.")
+
+    try:
+        with metrics.stage("merge") as rec:
+            merged_cards = [merge_card(card, features_lookup) for card in decision_cards]
+
+            # Save the merged output
+            result_json_filename = os.path.join(session_folder, RESULT_JSON_RELPATH)
+            os.makedirs(os.path.dirname(result_json_filename), exist_ok=True)
+            with open(result_json_filename, "w", encoding='utf-8') as f:
+                json.dump(merged_cards, f, indent=2)
+            rec.items = len(merged_cards)
+            rec.bytes = file_size(result_json_filename)
         print(result_json_filename)
 
         logging.info("debug 1 ")
         logging.info(f"All keys in first decision_card: {list(merged_cards[0].keys())}")
-        # Update Jira with the results, if needed
-        # (You can safely comment or keep existing Jira code below if you want, it's bias-agnostic)
-        for card in merged_cards:
-            issue_id = card.get("jira_id") or card.get("jira_key") or card.get("issue_key")
-            logging.info("debug issue_id : %s", issue_id)
-            priority = card.get("priority_score")
-            logging.info("debug priority : %s", priority)
-            rationale = card.get("rationale")
-            logging.info("debug rationale : %s", rationale)
-            if issue_id and priority and rationale:
-                update_jira_issue(issue_id, priority, rationale)
         logging.info("debug:end of openrouter/")
-        return result_json_filename
+        return merged_cards
 
     except Exception as e:
         logging.error("Error processing response: %s", str(e))
         print("Failed to process API response. Check log for details.")
-        return ""
+        return []
 
-def move_data_rows(sheet_url, worksheet_name_source, worksheet_name_target):
+def move_data_rows(sheet_url, worksheet_name_source, worksheet_name_target, backend=None):
+    load_env()
     try:
-        google_creds_json = os.environ.get("GOOGLE_CLOUD_CREDS_JSON")
-        if not google_creds_json:
-            logging.error("Missing GOOGLE_CLOUD_CREDS_JSON environment variable.")
-            return
-        creds_dict = json.loads(google_creds_json)
-        scopes = ["https://www.googleapis.com/auth/spreadsheets"]
-        credentials = Credentials.from_service_account_info(creds_dict, scopes=scopes)
-        gc = gspread.authorize(credentials)
-        sh = gc.open_by_url(sheet_url)
-        ws_source = sh.worksheet(worksheet_name_source)
-        ws_target = sh.worksheet(worksheet_name_target)
-
-        all_rows = ws_source.get_all_values()
-        num_rows = len(all_rows)
-        if num_rows > 1:
-            header = all_rows[0]
-            data_rows = all_rows[1:]
-            ws_target.append_rows(data_rows)
-            for i in range(num_rows, 1, -1):
-                ws_source.delete_rows(i)
-            logging.info(f"Moved {num_rows - 1} data rows from {worksheet_name_source} to {worksheet_name_target}, retained headers only in source.")
-        else:
-            logging.info(f"No data rows to move; {worksheet_name_source} only contains header.")
+        if backend is None:
+            google_creds_json = os.environ.get("GOOGLE_CLOUD_CREDS_JSON")
+            if not google_creds_json:
+                logging.error("Missing GOOGLE_CLOUD_CREDS_JSON environment variable.")
+                return
+            backend = GspreadBackend(sheet_url, json.loads(google_creds_json))
+        moved = move_rows(backend, worksheet_name_source, worksheet_name_target)
+        logging.info(f"Sheet archive used {backend.calls} backend calls.")
+        if moved:
+            FeedbackStore.for_sheet(sheet_url, worksheet_name_source).reset_after_archive()
+        return moved
     except Exception as e:
         logging.error(f"Error moving data rows from Google Sheet: {e}")
         import traceback
         logging.error(traceback.format_exc())
 
-def update_jira_issue(issue_id, priority, rationale):
-    jira_url = os.environ["JIRA_URL"]
-    jira_user = os.environ["JIRA_USER"]
-    jira_token = os.environ["JIRA_TOKEN"]
-    priority_field = os.environ.get("JIRA_PRIORITY_FIELD", "priority")
-    rationale_field = os.environ["JIRA_RATIONALE_FIELD"]
-
-    api_url = f"{jira_url}/rest/api/3/issue/{issue_id}"
-    logging.info(f"Jira url to update : {api_url})")
-    auth = (jira_user, jira_token)
-    rationale_adf = {
-        "type": "doc",
-        "version": 1,
-        "content": [
-            {
-                "type": "paragraph",
-                "content": [
-                    {"type": "text", "text": rationale}
-                ]
-            }
-        ]
-    }
-    payload = {
-        "fields": {
-            priority_field: priority,
-            rationale_field: rationale_adf
-        }
-    }
-    logging.info("Request Body: %s", json.dumps(payload, indent=2))
-    headers = {"Accept": "application/json", "Content-Type": "application/json"}
-    response = requests.put(api_url, auth=auth, headers=headers, data=json.dumps(payload))
-    if response.status_code == 204:
-        logging.info(f"Jira issue {issue_id} updated: priority={priority}, rationale={rationale}")
-    else:
-        logging.error(f"Failed to update Jira {issue_id}: {response.status_code} {response.text}")
+def start_jira_push(session_folder):
+    try:
+        updater = JiraUpdater.from_env()
+    except KeyError as e:
+        logging.error(f"Jira not configured, skipping update: missing {e}")
+        return None
+    # Skip issues whose priority and rationale match the last successful push (JIRA_SYNC_FORCE=1 pushes all)
+    return JiraPush(
+        updater,
+        SyncLedger.from_env(),
+        session_id=os.path.basename(os.path.normpath(session_folder)),
+        force=os.environ.get("JIRA_SYNC_FORCE") == "1",
+    )
+
+def finish_jira_push(jira_push, session_folder):
+    if jira_push is None:
+        return None
+    summary = jira_push.finish()
+    summary_filename = os.path.join(session_folder, "llm_eval_output/jira_update_summary.json")
+    os.makedirs(os.path.dirname(summary_filename), exist_ok=True)
+    with open(summary_filename, "w", encoding='utf-8') as f:
+        json.dump(summary, f, indent=2)
+    return summary
 
 if __name__ == "__main__":
-    sheet_url = "https://docs.google.com/spreadsheets/d/1XMgrnVNwMaQ_o2QSLVyAWC59TKhPvqr2_z9Z75h_1x4"
-    worksheet_name = "Sheet1"
+    sheet_url = FEEDBACK_SHEET_URL
+    worksheet_name = FEEDBACK_WORKSHEET
     features_path = sys.argv[1] if len(sys.argv) > 1 else "Resources/LLMadapter/features.json"
     session_folder = sys.argv[2] if len(sys.argv) > 2 else "Output/Session9999_default"
 
@@ -268,7 +692,6 @@ if __name__ == "__main__":
     logging.info("In Openrouter.py")
 
     feedback_data = get_reflexive_feedback(sheet_url, worksheet_name)
-    feedback_json = json.dumps(feedback_data, indent=2)
 
-    send_openrouter_request(features_path, session_folder, feedback_json)
-    move_data_rows(sheet_url, worksheet_name_source="Sheet1", worksheet_name_target="Sheet2")
+    send_openrouter_request(features_path, session_folder, feedback_data)
+    move_data_rows(sheet_url, worksheet_name_source=FEEDBACK_WORKSHEET, worksheet_name_target=ARCHIVE_WORKSHEET)
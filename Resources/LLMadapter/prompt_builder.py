@@ -0,0 +1,141 @@
+import os
+import json
+import math
+import logging
+
+# Prompt construction for decision-card requests: tabular encodings with empty fields dropped,
+# and a per-model token budget enforced by trimming the lowest-value content first.
+
+# Approximate context windows; the completion reservation below is taken out of these
+MODEL_TOKEN_BUDGETS = {
+    "nvidia/nemotron-nano-12b-v2-vl:free": 128000,
+    "openai/gpt-4o": 128000,
+    "openai/gpt-4o-mini": 128000,
+}
+DEFAULT_TOKEN_BUDGET = 32000
+COMPLETION_TOKENS_PER_FEATURE = 200
+CHARS_PER_TOKEN = 4.0
+
+# Free-text fields shortened, in order, when features alone do not fit
+TRUNCATABLE_FIELDS = ["description", "dissent", "value_agreement", "dependencies", "biases"]
+TRUNCATE_STEPS = [1200, 600, 300, 150]
+
+PROMPT_INSTRUCTIONS = (
+    "Analyze the following list of feature metadata. For each feature, generate a decision card "
+    "including all input fields, a priority score (1-10), and a rationale. Use only the inputs provided in "
+    "the features table to determine priority, do not invent anything on your own. "
+    "Additionally, study the following reflexive feedback from previous issue releases, "
+    "the deviations in prioritization, and post-release feedback, and incorporate this analysis into your final priority evaluation. "
+    "Try to avoid assigning the same priority to more than one feature. Return the output in JSON array format, "
+    "with each 'decision_card' json object containing jira id, summary, value agreement, dissent, dependencies, biases, "
+    "a priority_score, and a rationale. "
+    "Do not return anything else.\n"
+)
+TABLE_NOTE = "Both tables below are JSON lines: the first line is the column header and every following line is one record.\n"
+
+def estimate_tokens(text):
+    chars_per_token = float(os.environ.get("STAR_PROMPT_CHARS_PER_TOKEN", CHARS_PER_TOKEN))
+    return int(math.ceil(len(text) / chars_per_token))
+
+def token_budget(model, num_features):
+    # Prompt budget = model context (or STAR_PROMPT_TOKEN_BUDGET) minus room for the cards to come back
+    override = os.environ.get("STAR_PROMPT_TOKEN_BUDGET")
+    context = int(override) if override else MODEL_TOKEN_BUDGETS.get(model, DEFAULT_TOKEN_BUDGET)
+    return max(context - num_features * COMPLETION_TOKENS_PER_FEATURE, 0)
+
+def to_table(records):
+    # Header row plus value rows; columns empty in every record are dropped
+    columns = []
+    for record in records:
+        for k, v in record.items():
+            if v not in ("", None, [], {}) and k not in columns:
+                columns.append(k)
+    lines = [json.dumps(columns, ensure_ascii=False, separators=(",", ":"))]
+    for record in records:
+        row = [record.get(k, "") for k in columns]
+        lines.append(json.dumps(row, ensure_ascii=False, separators=(",", ":")))
+    return "\n".join(lines)
+
+def truncate_fields(features, limit):
+    truncated = 0
+    result = []
+    for feature in features:
+        feature = dict(feature)
+        for field in TRUNCATABLE_FIELDS:
+            value = feature.get(field)
+            if isinstance(value, str) and len(value) > limit:
+                feature[field] = value[:limit].rstrip() + "..."
+                truncated += 1
+        result.append(feature)
+    return result, truncated
+
+def render_prompt(feedback_records, features, prompt_format="compact"):
+    if prompt_format == "json":
+        return (
+            PROMPT_INSTRUCTIONS
+            + "Reflexive_Feedback_JSON:\n"
+            + f"{json.dumps(feedback_records, indent=2)}\n"
+            + "Features_JSON:\n"
+            + f"{json.dumps(features, indent=2)}"
+        )
+    return (
+        PROMPT_INSTRUCTIONS
+        + TABLE_NOTE
+        + "Reflexive_Feedback_TABLE:\n"
+        + f"{to_table(feedback_records)}\n"
+        + "Features_TABLE:\n"
+        + f"{to_table(features)}"
+    )
+
+def build_prompt(feedback_records, features, model):
+    # Returns (prompt, report). Trimming order, cheapest loss first: very long free-text fields,
+    # then the oldest feedback rows, then progressively shorter free-text fields.
+    prompt_format = os.environ.get("STAR_PROMPT_FORMAT", "compact")
+    budget = token_budget(model, len(features))
+    feedback_records = list(feedback_records or [])
+    report = {
+        "format": prompt_format,
+        "budget_tokens": budget,
+        "feedback_rows": len(feedback_records),
+        "feedback_rows_dropped": 0,
+        "fields_truncated": 0,
+    }
+
+    prompt = render_prompt(feedback_records, features, prompt_format)
+    tokens = estimate_tokens(prompt)
+
+    if tokens > budget:
+        features, report["fields_truncated"] = truncate_fields(features, TRUNCATE_STEPS[0])
+        prompt = render_prompt(feedback_records, features, prompt_format)
+        tokens = estimate_tokens(prompt)
+
+    if tokens > budget and feedback_records:
+        # Drop oldest feedback rows; binary search for how many of the newest rows fit
+        lo, hi = 0, len(feedback_records)
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            candidate = render_prompt(feedback_records[-mid:] if mid else [], features, prompt_format)
+            if estimate_tokens(candidate) <= budget:
+                lo = mid
+            else:
+                hi = mid - 1
+        kept = feedback_records[-lo:] if lo else []
+        report["feedback_rows_dropped"] = len(feedback_records) - len(kept)
+        feedback_records = kept
+        prompt = render_prompt(feedback_records, features, prompt_format)
+        tokens = estimate_tokens(prompt)
+
+    for limit in TRUNCATE_STEPS[1:]:
+        if tokens <= budget:
+            break
+        trimmed, truncated = truncate_fields(features, limit)
+        report["fields_truncated"] = truncated
+        prompt = render_prompt(feedback_records, trimmed, prompt_format)
+        tokens = estimate_tokens(prompt)
+
+    report["estimated_tokens"] = tokens
+    report["over_budget"] = tokens > budget
+    if report["over_budget"]:
+        logging.warning("Prompt still over budget after trimming (%s > %s tokens); consider OPENROUTER_BATCH_SIZE", tokens, budget)
+    logging.info("Prompt build: %s", report)
+    return prompt, report
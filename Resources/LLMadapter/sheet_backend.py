@@ -0,0 +1,131 @@
+import os
+import csv
+import json
+import logging
+
+# Minimal worksheet interface used by the feedback fetch and archive steps.
+# Every backend counts the round trips it makes so moves can be compared offline.
+
+class SheetBackend:
+    def __init__(self):
+        self.calls = 0
+
+    def get_all_values(self, worksheet_name):
+        raise NotImplementedError
+
+    def get_header_and_rows_from(self, worksheet_name, start_row, num_cols):
+        # (header row, rows start_row..end limited to the first num_cols columns) in a single call;
+        # rows are 1-based and missing ones come back empty
+        raise NotImplementedError
+
+    def append_rows(self, worksheet_name, rows):
+        raise NotImplementedError
+
+    def delete_data_rows(self, worksheet_name, last_row):
+        # Remove rows 2..last_row (1-based, header kept) in a single call
+        raise NotImplementedError
+
+class GspreadBackend(SheetBackend):
+    def __init__(self, sheet_url, creds_dict, scopes=("https://www.googleapis.com/auth/spreadsheets",)):
+        super().__init__()
+        import gspread
+        from google.oauth2.service_account import Credentials
+        credentials = Credentials.from_service_account_info(creds_dict, scopes=list(scopes))
+        gc = gspread.authorize(credentials)
+        self.spreadsheet = gc.open_by_url(sheet_url)
+        self.calls += 1
+        self._worksheets = {}
+
+    @classmethod
+    def from_env(cls, sheet_url, scopes=("https://www.googleapis.com/auth/spreadsheets",)):
+        google_creds_json = os.environ.get("GOOGLE_CLOUD_CREDS_JSON")
+        if not google_creds_json:
+            raise RuntimeError("Missing GOOGLE_CLOUD_CREDS_JSON environment variable")
+        return cls(sheet_url, json.loads(google_creds_json), scopes)
+
+    def worksheet(self, worksheet_name):
+        if worksheet_name not in self._worksheets:
+            self._worksheets[worksheet_name] = self.spreadsheet.worksheet(worksheet_name)
+            self.calls += 1
+        return self._worksheets[worksheet_name]
+
+    def get_all_values(self, worksheet_name):
+        ws = self.worksheet(worksheet_name)
+        self.calls += 1
+        return ws.get_all_values()
+
+    def get_header_and_rows_from(self, worksheet_name, start_row, num_cols):
+        from gspread.utils import rowcol_to_a1
+        ws = self.worksheet(worksheet_name)
+        last_col = rowcol_to_a1(1, max(num_cols, 1)).rstrip("0123456789")
+        self.calls += 1
+        header, rows = ws.batch_get(["1:1", f"A{start_row}:{last_col}"])
+        return (header[0] if header else []), list(rows)
+
+    def append_rows(self, worksheet_name, rows):
+        ws = self.worksheet(worksheet_name)
+        self.calls += 1
+        ws.append_rows(rows)
+
+    def delete_data_rows(self, worksheet_name, last_row):
+        if last_row < 2:
+            return
+        ws = self.worksheet(worksheet_name)
+        self.calls += 1
+        ws.delete_rows(2, last_row)
+
+class CsvSheetBackend(SheetBackend):
+    # One <worksheet_name>.csv per worksheet inside a local directory
+    def __init__(self, directory):
+        super().__init__()
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, worksheet_name):
+        return os.path.join(self.directory, f"{worksheet_name}.csv")
+
+    def _write(self, worksheet_name, rows):
+        path = self._path(worksheet_name)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerows(rows)
+        os.replace(tmp_path, path)
+
+    def get_all_values(self, worksheet_name):
+        self.calls += 1
+        path = self._path(worksheet_name)
+        if not os.path.exists(path):
+            return []
+        with open(path, newline="", encoding="utf-8") as f:
+            return [row for row in csv.reader(f)]
+
+    def get_header_and_rows_from(self, worksheet_name, start_row, num_cols):
+        rows = self.get_all_values(worksheet_name)
+        return (rows[0] if rows else []), [r[:num_cols] for r in rows[start_row - 1:]]
+
+    def append_rows(self, worksheet_name, rows):
+        self.calls += 1
+        with open(self._path(worksheet_name), "a", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerows(rows)
+
+    def delete_data_rows(self, worksheet_name, last_row):
+        if last_row < 2:
+            return
+        self.calls += 1
+        path = self._path(worksheet_name)
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = [row for row in csv.reader(f)]
+        self._write(worksheet_name, rows[:1] + rows[last_row:])
+
+def move_rows(backend, worksheet_name_source, worksheet_name_target):
+    # One read, one append and one ranged delete, regardless of row count
+    all_rows = backend.get_all_values(worksheet_name_source)
+    num_rows = len(all_rows)
+    if num_rows <= 1:
+        logging.info(f"No data rows to move; {worksheet_name_source} only contains header.")
+        return 0
+    data_rows = all_rows[1:]
+    backend.append_rows(worksheet_name_target, data_rows)
+    backend.delete_data_rows(worksheet_name_source, num_rows)
+    logging.info(f"Moved {num_rows - 1} data rows from {worksheet_name_source} to {worksheet_name_target}, retained headers only in source.")
+    return num_rows - 1
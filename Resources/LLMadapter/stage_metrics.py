@@ -0,0 +1,124 @@
+import os
+import json
+import math
+import time
+import datetime
+import threading
+from contextlib import contextmanager
+
+# Structured per-stage metrics for one pipeline run, written to <session>/metrics.json.
+# A stage may be timed several times (one LLM call per batch, ...); calls, seconds, items and
+# bytes accumulate, so concurrent stages report summed time next to the run's wall time.
+
+METRICS_FILENAME = "metrics.json"
+PROMETHEUS_FILENAME = "metrics.prom"
+
+# Canonical stage order; anything else recorded is appended after these
+STAGES = [
+    "workshop_wait",
+    "feedback_fetch",
+    "prompt_build",
+    "llm_call",
+    "merge",
+    "jira_push",
+    "html_render",
+    "sheet_archive",
+]
+
+class StageRecord:
+    def __init__(self):
+        self.items = 0
+        self.bytes = 0
+
+class StageMetrics:
+    def __init__(self, session_id=""):
+        self.session_id = session_id
+        self.started_at = datetime.datetime.utcnow().isoformat(timespec="seconds") + "Z"
+        self.started = time.perf_counter()
+        self.stages = {}
+        self._lock = threading.Lock()
+
+    def add(self, stage, seconds, items=0, nbytes=0):
+        with self._lock:
+            entry = self.stages.setdefault(stage, {"calls": 0, "seconds": 0.0, "items": 0, "bytes": 0})
+            entry["calls"] += 1
+            entry["seconds"] += seconds
+            entry["items"] += items
+            entry["bytes"] += nbytes
+
+    def count(self, stage, items=0, nbytes=0):
+        # Items/bytes known only after the timed part (e.g. cards parsed from an LLM call)
+        with self._lock:
+            entry = self.stages.setdefault(stage, {"calls": 0, "seconds": 0.0, "items": 0, "bytes": 0})
+            entry["items"] += items
+            entry["bytes"] += nbytes
+
+    @contextmanager
+    def stage(self, stage):
+        # with metrics.stage("merge") as rec: ...; rec.items = len(cards)
+        record = StageRecord()
+        started = time.perf_counter()
+        try:
+            yield record
+        finally:
+            self.add(stage, time.perf_counter() - started, record.items, record.bytes)
+
+    def to_dict(self):
+        with self._lock:
+            names = [s for s in STAGES if s in self.stages] + sorted(s for s in self.stages if s not in STAGES)
+            stages = {name: dict(self.stages[name], seconds=round(self.stages[name]["seconds"], 4)) for name in names}
+        return {
+            "session": self.session_id,
+            "started_at": self.started_at,
+            "wall_seconds": round(time.perf_counter() - self.started, 4),
+            "stages": stages,
+        }
+
+    def write(self, session_folder):
+        # metrics.json always; metrics.prom (Prometheus textfile-collector format) with STAR_METRICS_PROMETHEUS=1
+        data = self.to_dict()
+        path = os.path.join(session_folder, METRICS_FILENAME)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        if os.environ.get("STAR_METRICS_PROMETHEUS") == "1":
+            with open(os.path.join(session_folder, PROMETHEUS_FILENAME), "w", encoding="utf-8") as f:
+                f.write(session_prometheus_text(data))
+        return path
+
+def file_size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+def percentile(values, pct):
+    # Nearest-rank percentile, or None for no values (shared by starMetrics.py and llm_telemetry.py)
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    # Smallest value with at least pct% of the values at or below it; pct * n is formed first so
+    # the product stays exact (99.9 / 100 * 1000 comes out just above 999)
+    rank = max(math.ceil(pct * len(ordered) / 100), 1) - 1
+    return ordered[min(rank, len(ordered) - 1)]
+
+def prometheus_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def session_prometheus_text(data):
+    # Gauges for a single run, labelled by session and stage
+    session = prometheus_label(data["session"])
+    lines = []
+    for metric, field, help_text in (
+        ("star_stage_seconds", "seconds", "Time spent in the stage (summed over calls)"),
+        ("star_stage_calls", "calls", "Times the stage ran"),
+        ("star_stage_items", "items", "Items processed by the stage"),
+        ("star_stage_bytes", "bytes", "Bytes produced or transferred by the stage"),
+    ):
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} gauge")
+        for stage, entry in data["stages"].items():
+            lines.append(f'{metric}{{session="{session}",stage="{stage}"}} {entry[field]}')
+    lines.append("# HELP star_pipeline_wall_seconds Wall time of the pipeline run")
+    lines.append("# TYPE star_pipeline_wall_seconds gauge")
+    lines.append(f'star_pipeline_wall_seconds{{session="{session}"}} {data["wall_seconds"]}')
+    return "\n".join(lines) + "\n"
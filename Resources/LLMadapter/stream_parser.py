@@ -0,0 +1,92 @@
+import json
+import logging
+
+# Incremental parsing of streamed completions: SSE "data:" lines from an OpenAI-compatible
+# endpoint, and a JSON-array scanner that yields each decision card as soon as its object closes.
+
+class StreamError(Exception):
+    # The provider reported an error mid-stream; callers retry it like a dropped connection
+    pass
+
+def iter_sse_content(lines, usage=None):
+    # lines: iterable of decoded SSE lines; yields the assistant content deltas.
+    # The token usage block (sent with the final chunk) is copied into the usage dict if given.
+    for line in lines:
+        if not line or line.startswith(":"):
+            continue  # keep-alive comments such as ": OPENROUTER PROCESSING"
+        if not line.startswith("data:"):
+            continue
+        data = line[5:].strip()
+        if data == "[DONE]":
+            break
+        try:
+            chunk = json.loads(data)
+        except ValueError:
+            logging.warning("Skipping malformed SSE chunk: %s", data[:200])
+            continue
+        if "error" in chunk:
+            raise StreamError(f"Stream error: {chunk['error']}")
+        if usage is not None and chunk.get("usage"):
+            usage.update(chunk["usage"])
+        for choice in chunk.get("choices", []):
+            content = (choice.get("delta") or {}).get("content")
+            if content:
+                yield content
+
+class DecisionCardStream:
+    # Feed text fragments; feed() returns the cards completed by that fragment.
+    # Objects that fail to parse are kept in self.errors instead of aborting the stream.
+    def __init__(self):
+        self.started = False
+        self.finished = False
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+        self.current = []
+        self.errors = []
+        self.cards = []
+
+    def feed(self, text):
+        completed = []
+        for ch in text:
+            if self.finished:
+                break
+            if not self.started:
+                if ch == "[":
+                    self.started = True
+                continue
+            if self.depth == 0:
+                if ch == "{":
+                    self.depth = 1
+                    self.current = [ch]
+                elif ch == "]":
+                    self.finished = True
+                continue
+            self.current.append(ch)
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif ch == "\\":
+                    self.escape = True
+                elif ch == '"':
+                    self.in_string = False
+                continue
+            if ch == '"':
+                self.in_string = True
+            elif ch in "{[":
+                self.depth += 1
+            elif ch in "}]":
+                self.depth -= 1
+                if self.depth == 0:
+                    obj_text = "".join(self.current)
+                    self.current = []
+                    try:
+                        card = json.loads(obj_text)
+                    except ValueError as e:
+                        logging.warning("Discarding malformed decision card: %s", e)
+                        self.errors.append(obj_text)
+                        continue
+                    if isinstance(card, dict):
+                        self.cards.append(card)
+                        completed.append(card)
+        return completed
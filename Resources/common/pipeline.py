@@ -0,0 +1,134 @@
+import os
+import sys
+import json
+import logging
+import importlib.util
+
+# In-process STAR pipeline: workshop records -> LLM evaluation -> HTML report.
+# Stages hand each other Python data; JSON/HTML files are still written into the session
+# folder, but only as artifacts, never as the way results travel between stages.
+
+RESOURCES_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Written by the workshop next to consolidated_reasoning.json when a session is finalized;
+# starWatch.py only picks up sessions that have one
+FINALIZED_MARKER = "session_finalized.json"
+LLM_ADAPTER_DIR = os.path.join(RESOURCES_DIR, "LLMadapter")
+
+def load_module(name, relative_path):
+    # Import a Resources/ script by path (some file names, like workshop-tool.py, are not importable)
+    if name in sys.modules:
+        return sys.modules[name]
+    path = os.path.join(RESOURCES_DIR, relative_path)
+    module_dir = os.path.dirname(path)
+    if module_dir not in sys.path:
+        sys.path.insert(0, module_dir)  # sibling helpers (llm_cache, jira_sync, ...) import by bare name
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    try:
+        spec.loader.exec_module(module)
+    except Exception:
+        del sys.modules[name]
+        raise
+    return module
+
+def workshop_module():
+    return load_module("star_workshop_tool", os.path.join("gui-tool", "workshop-tool.py"))
+
+def llm_module():
+    return load_module("openRouter", os.path.join("LLMadapter", "openRouter.py"))
+
+def render_module():
+    return load_module("json_to_html", os.path.join("resultsView", "json_to_html.py"))
+
+def metrics_module():
+    return load_module("stage_metrics", os.path.join("LLMadapter", "stage_metrics.py"))
+
+def new_metrics(session_folder):
+    return metrics_module().StageMetrics(os.path.basename(os.path.normpath(session_folder)))
+
+def html_output_path(session_folder):
+    return os.path.join(session_folder, "llm_eval_output", "star_decision_cards.html")
+
+def result_json_path(session_folder):
+    # Merged decision cards written by the LLM stage
+    return os.path.join(session_folder, llm_module().RESULT_JSON_RELPATH)
+
+# Every stage takes an optional StageMetrics (see LLMadapter/stage_metrics.py); the LLM stage
+# records prompt_build, llm_call, merge and jira_push itself.
+
+def run_feedback_stage(metrics=None):
+    llm = llm_module()
+    if metrics is None:
+        return llm.get_reflexive_feedback(llm.FEEDBACK_SHEET_URL, llm.FEEDBACK_WORKSHEET)
+    with metrics.stage("feedback_fetch") as rec:
+        feedback = llm.get_reflexive_feedback(llm.FEEDBACK_SHEET_URL, llm.FEEDBACK_WORKSHEET)
+        rec.items = len(feedback)
+        rec.bytes = len(json.dumps(feedback).encode("utf-8"))
+    return feedback
+
+def run_llm_stage(features, session_folder, feedback, metrics=None, push_jira=True):
+    # Returns the merged decision cards ([] on failure)
+    return llm_module().evaluate_features(features, session_folder, feedback, metrics=metrics, push_jira=push_jira)
+
+def run_render_stage(cards, session_folder, open_browser=False, metrics=None):
+    render = render_module()
+    metrics = metrics or new_metrics(session_folder)
+    with metrics.stage("html_render") as rec:
+        html_path = render.render_html(cards, html_output_path(session_folder))
+        rec.items = len(cards)
+        rec.bytes = metrics_module().file_size(html_path)
+    if open_browser:
+        render.open_in_browser(html_path)
+    return html_path
+
+def run_archive_stage(metrics=None):
+    llm = llm_module()
+    metrics = metrics or new_metrics("")
+    with metrics.stage("sheet_archive") as rec:
+        rec.items = llm.move_data_rows(llm.FEEDBACK_SHEET_URL, worksheet_name_source=llm.FEEDBACK_WORKSHEET,
+                                       worksheet_name_target=llm.ARCHIVE_WORKSHEET) or 0
+
+def run_index_stage(session_folder):
+    # Adds the finished session to the cross-session index (see starIndex.py); STAR_INDEX=0 skips it.
+    # A failure here is logged, never raised: the session itself is complete.
+    if os.environ.get("STAR_INDEX", "1") == "0":
+        return 0
+    try:
+        from starIndex import index_session
+        return index_session(session_folder)
+    except Exception:
+        logging.exception("Could not index session %s", session_folder)
+        return 0
+
+def write_metrics(metrics, session_folder):
+    try:
+        return metrics.write(session_folder)
+    except OSError:
+        logging.exception("Could not write stage metrics")
+        return ""
+
+def run_pipeline(features, session_folder, feedback=None, open_browser=False, archive_feedback=True, metrics=None,
+                 push_jira=True):
+    # Everything after the workshop, in this process. Returns a dict describing the outcome.
+    # Stage metrics are written to <session_folder>/metrics.json whether or not the run succeeds.
+    result = {"ok": False, "cards": [], "result_path": "", "html_path": "", "error": ""}
+    metrics = metrics or new_metrics(session_folder)
+    try:
+        if feedback is None:
+            feedback = run_feedback_stage(metrics)
+        cards = run_llm_stage(features, session_folder, feedback, metrics, push_jira)
+        if not cards:
+            result["error"] = "LLM evaluation returned no decision cards"
+            logging.error(result["error"])
+            return result
+        result["cards"] = cards
+        result["result_path"] = os.path.abspath(result_json_path(session_folder))
+        result["html_path"] = os.path.abspath(run_render_stage(cards, session_folder, open_browser, metrics))
+        if archive_feedback:
+            run_archive_stage(metrics)
+        run_index_stage(session_folder)
+        result["ok"] = True
+        return result
+    finally:
+        write_metrics(metrics, session_folder)
@@ -0,0 +1,157 @@
+import os
+import io
+import sys
+import json
+import time
+import argparse
+import logging
+import contextlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pipeline
+
+# Headless batch mode: evaluate, merge and render many finalized sessions across a process pool.
+#   python Resources/common/starBatch.py Output/ --workers 4
+#   python Resources/common/starBatch.py Output/Session1234_*/consolidated_reasoning.json --no-jira
+
+SESSION_INPUT_NAME = "consolidated_reasoning.json"
+# Sessions recorded before the workshop ran inside starLauncher keep their records one level down,
+# in <session>/workshop_output/; their results are still written to <session>/llm_eval_output/
+LEGACY_INPUT_DIR = "workshop_output"
+
+def session_folder_of(input_path):
+    folder = os.path.dirname(os.path.abspath(input_path))
+    return os.path.dirname(folder) if os.path.basename(folder) == LEGACY_INPUT_DIR else folder
+
+def session_input_path(session_folder):
+    # The session's records file, falling back to the old subfolder when the root has none
+    path = os.path.join(session_folder, SESSION_INPUT_NAME)
+    legacy_path = os.path.join(session_folder, LEGACY_INPUT_DIR, SESSION_INPUT_NAME)
+    return legacy_path if not os.path.isfile(path) and os.path.isfile(legacy_path) else path
+
+def find_session_inputs(paths):
+    # Files are taken as-is; directories are searched recursively for consolidated_reasoning.json
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            for dirpath, dirnames, filenames in os.walk(path):
+                dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+                if SESSION_INPUT_NAME in filenames:
+                    found.append(os.path.join(dirpath, SESSION_INPUT_NAME))
+        elif os.path.isfile(path):
+            found.append(path)
+        else:
+            logging.warning("Skipping missing input: %s", path)
+    seen = set()
+    unique = []
+    for path in found:
+        key = os.path.abspath(path)
+        if key not in seen:
+            seen.add(key)
+            unique.append(key)
+    return unique
+
+def configure_session_logging(session_folder):
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+    handler = logging.FileHandler(os.path.join(session_folder, "debug-prints.log"), encoding="utf-8")
+    handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(message)s'))
+    root.addHandler(handler)
+    root.setLevel(logging.DEBUG)
+
+def process_session(input_path, feedback, no_jira=False):
+    # Runs in a worker process; never raises, always returns a summary row
+    session_folder = session_folder_of(input_path)
+    row = {
+        "session": os.path.basename(session_folder),
+        "input": input_path,
+        "ok": False,
+        "features": 0,
+        "cards": 0,
+        "seconds": 0.0,
+        "html_path": "",
+        "error": "",
+    }
+    started = time.perf_counter()
+    captured = io.StringIO()
+    try:
+        configure_session_logging(session_folder)
+        logging.info("starBatch processing %s", input_path)
+        with open(input_path, "r", encoding="utf-8") as f:
+            features = json.load(f)
+        if isinstance(features, dict):
+            features = [features]
+        row["features"] = len(features)
+        with contextlib.redirect_stdout(captured):
+            result = pipeline.run_pipeline(features, session_folder, feedback=feedback, archive_feedback=False,
+                                           push_jira=not no_jira)
+        row["ok"] = result["ok"]
+        row["cards"] = len(result["cards"])
+        row["html_path"] = result["html_path"]
+        row["error"] = result["error"]
+    except Exception as e:
+        logging.exception("starBatch failed for %s", input_path)
+        row["error"] = f"{type(e).__name__}: {e}"
+    finally:
+        if captured.getvalue():
+            logging.info("Stage output:\n%s", captured.getvalue().rstrip())
+        row["seconds"] = round(time.perf_counter() - started, 2)
+    return row
+
+def print_summary(rows, elapsed):
+    width = max([len("session")] + [len(r["session"]) for r in rows])
+    print(f"\n{'session':<{width}}  {'status':<6} {'features':>8} {'cards':>6} {'seconds':>8}  error")
+    for r in rows:
+        status = "ok" if r["ok"] else "FAILED"
+        print(f"{r['session']:<{width}}  {status:<6} {r['features']:>8} {r['cards']:>6} {r['seconds']:>8.2f}  {r['error']}")
+    failed = sum(1 for r in rows if not r["ok"])
+    print(f"\n{len(rows)} session(s), {len(rows) - failed} ok, {failed} failed, wall time {elapsed:.2f}s")
+
+def main():
+    parser = argparse.ArgumentParser(description="Process many STAR sessions without the GUI")
+    parser.add_argument("inputs", nargs="+", help="consolidated_reasoning.json files or directories containing them")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="Sessions processed in parallel")
+    parser.add_argument("--no-feedback", action="store_true", help="Do not fetch reflexive feedback")
+    parser.add_argument("--no-jira", action="store_true", help="Do not push results to Jira")
+    parser.add_argument("--summary", help="Also write the per-session summary as JSON to this path")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s %(levelname)s %(message)s')
+    inputs = find_session_inputs(args.inputs)
+    if not inputs:
+        print("No consolidated_reasoning.json inputs found.")
+        sys.exit(1)
+
+    # Feedback is fetched once and shared by every session instead of once per worker
+    if args.no_feedback:
+        feedback = []
+    else:
+        feedback = pipeline.run_feedback_stage()
+    print(f"Processing {len(inputs)} session(s) with {args.workers} worker(s)...")
+
+    started = time.perf_counter()
+    rows = []
+    with ProcessPoolExecutor(max_workers=max(args.workers, 1)) as pool:
+        futures = {pool.submit(process_session, path, feedback, args.no_jira): path for path in inputs}
+        for future in as_completed(futures):
+            try:
+                row = future.result()
+            except Exception as e:
+                path = futures[future]
+                row = {"session": os.path.basename(os.path.dirname(path)), "input": path, "ok": False,
+                       "features": 0, "cards": 0, "seconds": 0.0, "html_path": "", "error": f"worker crashed: {e}"}
+            rows.append(row)
+            print(f"  {'done' if row['ok'] else 'FAILED'}: {row['session']} ({row['seconds']:.2f}s)")
+    elapsed = time.perf_counter() - started
+
+    rows.sort(key=lambda r: r["session"])
+    print_summary(rows, elapsed)
+    if args.summary:
+        with open(args.summary, "w", encoding="utf-8") as f:
+            json.dump({"elapsed_seconds": round(elapsed, 2), "sessions": rows}, f, indent=2)
+    sys.exit(0 if all(r["ok"] for r in rows) else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+import os
+import sys
+import json
+import time
+import sqlite3
+import argparse
+import logging
+import datetime
+
+import pipeline
+from starBatch import SESSION_INPUT_NAME, session_folder_of, session_input_path
+
+# Cross-session index: workshop records (consolidated_reasoning.json) and decision cards
+# (llm_eval_output/star_decision_cards_full.json) of every session in one SQLite file, indexed on
+# issue key, session, module and timestamp. Files are re-read only when their mtime or size changes;
+# the pipeline indexes each session as it completes.
+#   python Resources/common/starIndex.py --root Output --ingest           pick up new/changed sessions
+#   python Resources/common/starIndex.py --issue JIRA-1437 --limit 20     priority history of one issue
+#   python Resources/common/starIndex.py --module Billing --since 2025-01-01 --records --json
+
+INDEX_FILENAME = ".star_index.sqlite"
+COMMIT_EVERY_SESSIONS = 50
+
+def default_db_path(root):
+    return os.environ.get("STAR_INDEX_DB") or os.path.join(root, INDEX_FILENAME)
+
+def iso_mtime(st):
+    return datetime.datetime.utcfromtimestamp(st.st_mtime).isoformat(timespec="seconds") + "Z"
+
+def as_text(value):
+    if isinstance(value, (list, tuple)):
+        return ", ".join(str(v) for v in value)
+    return "" if value is None else str(value)
+
+def priority(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+class SessionIndex:
+    def __init__(self, db_path):
+        self.db_path = db_path
+        # Batch/watch workers index sessions concurrently; WAL lets readers run alongside them
+        self.conn = sqlite3.connect(db_path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(
+            "CREATE TABLE IF NOT EXISTS files ("
+            " path TEXT PRIMARY KEY, kind TEXT NOT NULL, session_id TEXT NOT NULL,"
+            " mtime_ns INTEGER NOT NULL, size INTEGER NOT NULL, rows INTEGER NOT NULL, ingested_at TEXT);"
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            " session_id TEXT PRIMARY KEY, folder TEXT, started_at TEXT, evaluated_at TEXT);"
+            "CREATE TABLE IF NOT EXISTS records ("
+            " file TEXT NOT NULL, session_id TEXT NOT NULL, issue_key TEXT, module TEXT,"
+            " facilitator_id TEXT, timestamp TEXT, data TEXT NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS cards ("
+            " file TEXT NOT NULL, session_id TEXT NOT NULL, issue_key TEXT, module TEXT,"
+            " priority_score REAL, timestamp TEXT, data TEXT NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS records_issue ON records (issue_key, timestamp);"
+            "CREATE INDEX IF NOT EXISTS records_session ON records (session_id);"
+            "CREATE INDEX IF NOT EXISTS records_module ON records (module, timestamp);"
+            "CREATE INDEX IF NOT EXISTS records_timestamp ON records (timestamp);"
+            "CREATE INDEX IF NOT EXISTS records_file ON records (file);"
+            "CREATE INDEX IF NOT EXISTS cards_issue ON cards (issue_key, timestamp);"
+            "CREATE INDEX IF NOT EXISTS cards_session ON cards (session_id);"
+            "CREATE INDEX IF NOT EXISTS cards_module ON cards (module, timestamp);"
+            "CREATE INDEX IF NOT EXISTS cards_timestamp ON cards (timestamp);"
+            "CREATE INDEX IF NOT EXISTS cards_file ON cards (file);"
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    def ingest_file(self, path, kind, session_id, folder, force=False):
+        # Returns the number of rows written, or None when the file is unchanged since the last ingest
+        # (force re-reads it anyway). The caller commits.
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        row = self.conn.execute("SELECT mtime_ns, size FROM files WHERE path = ?", (path,)).fetchone()
+        if not force and row == (st.st_mtime_ns, st.st_size):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            data = [data]
+        self.conn.execute(f"DELETE FROM {kind} WHERE file = ?", (path,))
+        if kind == "records":
+            rows = [(path, session_id, r.get("issue_key"),
+                     as_text(r.get("custom_field_module") or r.get("module")) or None,
+                     r.get("facilitator_id"), r.get("timestamp"), json.dumps(r, ensure_ascii=False))
+                    for r in data if isinstance(r, dict)]
+            self.conn.executemany("INSERT INTO records VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            started = min((r[5] for r in rows if r[5]), default=None)
+            self.upsert_session(session_id, folder, started_at=started)
+        else:
+            # Cards carry no timestamp of their own: use the workshop record's, else the file's
+            workshop = {key: (module, ts) for key, module, ts in self.conn.execute(
+                "SELECT issue_key, module, timestamp FROM records WHERE session_id = ?", (session_id,))}
+            evaluated = iso_mtime(st)
+            rows = []
+            for c in data:
+                if not isinstance(c, dict):
+                    continue
+                key = c.get("jira_key") or c.get("issue_key") or c.get("jira_id")
+                module, ts = workshop.get(key, (None, None))
+                rows.append((path, session_id, key, as_text(c.get("module")) or module,
+                             priority(c.get("priority_score")), ts or evaluated, json.dumps(c, ensure_ascii=False)))
+            self.conn.executemany("INSERT INTO cards VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            self.upsert_session(session_id, folder, evaluated_at=evaluated)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (path, kind, session_id, st.st_mtime_ns, st.st_size, len(rows),
+             datetime.datetime.utcnow().isoformat(timespec="seconds") + "Z"),
+        )
+        return len(rows)
+
+    def upsert_session(self, session_id, folder, started_at=None, evaluated_at=None):
+        self.conn.execute(
+            "INSERT INTO sessions VALUES (?, ?, ?, ?) ON CONFLICT(session_id) DO UPDATE SET"
+            " folder = excluded.folder,"
+            " started_at = COALESCE(excluded.started_at, sessions.started_at),"
+            " evaluated_at = COALESCE(excluded.evaluated_at, sessions.evaluated_at)",
+            (session_id, folder, started_at, evaluated_at),
+        )
+
+    def ingest_session(self, session_folder, commit=True):
+        # Workshop records first, so cards can take their module and timestamp; cards are re-read
+        # whenever the records changed, since they carry copies of both
+        folder = os.path.abspath(session_folder)
+        session_id = os.path.basename(folder)
+        written = 0
+        records_changed = False
+        for path, kind in ((session_input_path(folder), "records"), (pipeline.result_json_path(folder), "cards")):
+            if not os.path.isfile(path):
+                continue
+            try:
+                count = self.ingest_file(path, kind, session_id, folder, force=kind == "cards" and records_changed)
+            except (OSError, ValueError) as e:
+                logging.warning("Index: skipping %s: %s", path, e)
+                continue
+            if kind == "records" and count is not None:
+                records_changed = True
+            written += count or 0
+        if commit:
+            self.conn.commit()
+        return written
+
+    def ingest_tree(self, root):
+        # Returns (sessions seen, rows written, files dropped)
+        sessions = 0
+        written = 0
+        seen = set()
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+            if SESSION_INPUT_NAME in filenames:
+                folder = session_folder_of(os.path.join(dirpath, SESSION_INPUT_NAME))
+            elif os.path.isfile(pipeline.result_json_path(dirpath)):
+                folder = os.path.abspath(dirpath)
+            else:
+                continue
+            if folder not in seen:
+                seen.add(folder)
+                sessions += 1
+                written += self.ingest_session(folder, commit=False)
+                if sessions % COMMIT_EVERY_SESSIONS == 0:
+                    self.conn.commit()
+        self.conn.commit()
+        return sessions, written, self.prune()
+
+    def prune(self):
+        # Forget files that were deleted since they were indexed
+        gone = [(path, kind) for path, kind in self.conn.execute("SELECT path, kind FROM files") if not os.path.exists(path)]
+        with self.conn:
+            for path, kind in gone:
+                self.conn.execute(f"DELETE FROM {kind} WHERE file = ?", (path,))
+                self.conn.execute("DELETE FROM files WHERE path = ?", (path,))
+        return len(gone)
+
+    def query(self, kind="cards", issue_key=None, session_id=None, module=None, since=None, until=None, limit=20):
+        # Newest first; every filter is served by one of the indexes above
+        where, params = [], []
+        for column, value in (("issue_key", issue_key), ("session_id", session_id), ("module", module)):
+            if value:
+                where.append(f"{column} = ?")
+                params.append(value)
+        if since:
+            where.append("timestamp >= ?")
+            params.append(since)
+        if until:
+            where.append("timestamp < ?")
+            params.append(until)
+        sql = f"SELECT session_id, timestamp, data FROM {kind}"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY timestamp DESC LIMIT ?"
+        params.append(limit)
+        results = []
+        for session_id_, timestamp, data in self.conn.execute(sql, params):
+            entry = json.loads(data)
+            entry.setdefault("session_id", session_id_)
+            entry["indexed_timestamp"] = timestamp
+            results.append(entry)
+        return results
+
+    def history(self, issue_key, limit=20):
+        # Priority of one issue across its most recent sessions
+        return self.query("cards", issue_key=issue_key, limit=limit)
+
+    def stats(self):
+        counts = {}
+        for table in ("sessions", "files", "records", "cards"):
+            counts[table] = self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        return counts
+
+def index_session(session_folder, db_path=None):
+    # Called by the pipeline when a session completes; the index lives in the sessions' parent folder
+    folder = os.path.abspath(session_folder)
+    index = SessionIndex(db_path or default_db_path(os.path.dirname(folder)))
+    try:
+        return index.ingest_session(folder)
+    finally:
+        index.close()
+
+def print_results(results, kind):
+    if kind == "records":
+        print(f"{'timestamp':<22}{'session':<32}{'issue':<16}{'value agreement':<18}module")
+        for r in results:
+            print(f"{r['indexed_timestamp'] or '-':<22}{r['session_id']:<32}{r.get('issue_key') or '-':<16}"
+                  f"{as_text(r.get('value_agreement'))[:16]:<18}{as_text(r.get('custom_field_module'))}")
+        return
+    print(f"{'timestamp':<22}{'session':<32}{'issue':<16}{'priority':>9}  summary")
+    for r in results:
+        key = r.get("jira_key") or r.get("issue_key") or r.get("jira_id") or "-"
+        print(f"{r['indexed_timestamp'] or '-':<22}{r['session_id']:<32}{key:<16}"
+              f"{as_text(r.get('priority_score')):>9}  {as_text(r.get('summary'))[:60]}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Query decision cards and workshop records across sessions")
+    parser.add_argument("--root", default="Output", help="Tree holding Session*/ folders")
+    parser.add_argument("--db", help=f"Index database (default $STAR_INDEX_DB or <root>/{INDEX_FILENAME})")
+    parser.add_argument("--ingest", action="store_true", help="Index new and changed sessions under --root first")
+    parser.add_argument("--issue", help="Only this issue key")
+    parser.add_argument("--session", help="Only this session id")
+    parser.add_argument("--module", help="Only this module")
+    parser.add_argument("--since", help="Only entries at or after this ISO timestamp/date")
+    parser.add_argument("--until", help="Only entries before this ISO timestamp/date")
+    parser.add_argument("--records", action="store_true", help="Query workshop records instead of decision cards")
+    parser.add_argument("--limit", type=int, default=20, help="Newest entries returned")
+    parser.add_argument("--json", action="store_true", help="Print full entries as JSON")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s %(levelname)s %(message)s')
+    db_path = args.db or default_db_path(args.root)
+    if not args.ingest and not os.path.exists(db_path):
+        print(f"No index at {db_path}; run with --ingest first")
+        sys.exit(1)
+    index = SessionIndex(db_path)
+    try:
+        if args.ingest:
+            started = time.perf_counter()
+            sessions, written, dropped = index.ingest_tree(args.root)
+            print(f"Indexed {sessions} session(s): {written} row(s) written, {dropped} file(s) dropped"
+                  f" in {time.perf_counter() - started:.2f}s")
+        if not (args.issue or args.session or args.module or args.since or args.until):
+            print(json.dumps(index.stats(), indent=2))
+            return
+        kind = "records" if args.records else "cards"
+        started = time.perf_counter()
+        results = index.query(kind, args.issue, args.session, args.module, args.since, args.until, args.limit)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if args.json:
+            print(json.dumps(results, indent=2, ensure_ascii=False))
+        else:
+            print_results(results, kind)
+            print(f"{len(results)} {kind} in {elapsed_ms:.1f} ms")
+    finally:
+        index.close()
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,12 @@
-import subprocess
 import threading
 import time
 import tkinter as tk
 from tkinter import ttk, messagebox
 import sys
 import os
-import random
 from datetime import datetime
 import logging
+import pipeline
 
 class STAR(tk.Tk):
     def __init__(self, session_id, session_folder):
@@ -89,6 +88,8 @@ class STAR(tk.Tk):
         self.result_path = ""
         self.html_path = ""
         self.summary_path = ""
+        self.metrics = None
+        self.workshop_opened = 0.0
 
     def finalize(self):
         self.session_label.config(text=f"Session: {self.session_id}")
@@ -97,8 +98,23 @@ class STAR(tk.Tk):
         self.btn_finalize.config(state=tk.DISABLED)
         self.btn_html.config(state=tk.DISABLED)
         self.btn_summary.config(state=tk.DISABLED)
-        threading.Thread(target=self.llm_workflow, daemon=True).start()
         self.animate_progress()
+        self.update_status("Waiting for feature data input (collaboration tool)...")
+        # The workshop runs as a window of this app; its records come back through the callback
+        self.metrics = pipeline.new_metrics(self.session_folder)
+        self.workshop_opened = time.perf_counter()
+        try:
+            pipeline.workshop_module().open_workshop(self, self.session_folder, self.on_workshop_done)
+        except Exception:
+            logging.exception("Collaboration tool failed to launch.")
+            self.finish_workflow("Collaboration tool failed to launch.")
+
+    def on_workshop_done(self, features):
+        self.metrics.add("workshop_wait", time.perf_counter() - self.workshop_opened, items=len(features or []))
+        if not features:
+            self.finish_workflow("Could not determine/copy JSON output file from collaboration tool.")
+            return
+        threading.Thread(target=self.llm_workflow, args=(features,), daemon=True).start()
 
     def animate_progress(self):
         def animate():
@@ -111,71 +127,43 @@ class STAR(tk.Tk):
                 time.sleep(0.6)
         threading.Thread(target=animate, daemon=True).start()
 
-    def llm_workflow(self):
-        self.update_status("Waiting for feature data input (collaboration tool)...")
+    def llm_workflow(self, features):
+        self.update_status("Submitting data to LLM evaluation engine...")
         try:
-            features_path = os.path.join(self.session_folder, "workshop_output")
-            collab_proc = subprocess.run(
-                [sys.executable, 'Resources/gui-tool/workshop-tool.py', features_path],
-                capture_output=True, text=True
-            )
-            for line in collab_proc.stdout.splitlines():
-                if line.strip().endswith('.json'):
-                    features_path = line.strip()
-            features_path = os.path.abspath(features_path)
-            if not os.path.isfile(features_path):
-                self.update_status("Could not determine/copy JSON output file from collaboration tool.")
+            feedback = pipeline.run_feedback_stage(self.metrics)
+            self.update_status("Awaiting response from AI...")
+            cards = pipeline.run_llm_stage(features, self.session_folder, feedback, self.metrics)
+            if not cards:
+                self.finish_workflow("LLM evaluation failed. Check debug-prints.log for details.")
                 return
+            self.result_path = os.path.abspath(pipeline.result_json_path(self.session_folder))
+            logging.info("debug : result_path %s", self.result_path)
+
+            # Run HTML renderer, save in same folder
+            self.html_path = os.path.abspath(pipeline.run_render_stage(cards, self.session_folder, True, self.metrics))
+            logging.info("debug : html_path %s", self.html_path)
+            pipeline.run_archive_stage(self.metrics)
+            pipeline.run_index_stage(self.session_folder)
         except Exception:
-            self.update_status("Collaboration tool failed to launch.")
+            logging.exception("LLM workflow failed")
+            self.finish_workflow("LLM evaluation failed. Check debug-prints.log for details.")
             return
-
-        self.update_status("Submitting data to LLM evaluation engine...")
-        result_path = os.path.join(self.session_folder, "llm_eval_output/star_decision_cards.json")
-        res = subprocess.run(
-            [sys.executable, 'Resources/LLMadapter/openRouter.py', features_path, self.session_folder],
-            capture_output=True, text=True
-        )
-
-        self.update_status("Awaiting response from AI...")
-        # Correct file extraction
-        for line in res.stdout.splitlines():
-            # Remove 'Ranking result saved to: ' if present
-            if line.strip().endswith('.json'):
-                if "saved to:" in line:
-                    result_path = line.split("saved to:")[-1].strip()
-                else:
-                    result_path = line.strip()
-        result_path = os.path.abspath(result_path)
-        logging.info("debug : line159 main")
-        self.result_path = result_path
-
-        logging.info("debug : line162 main")
-        # Run HTML renderer, save in same folder
-        html_path = os.path.join(self.session_folder, "llm_eval_output/star_decision_cards.html")
-        res_html = subprocess.run(
-            [sys.executable, 'Resources/resultsView/json_to_html.py', result_path, html_path],
-            capture_output=True, text=True
-        )
-        print("STDOUT from json_to_html.py:", res_html.stdout)
-        print("STDERR from json_to_html.py:", res_html.stderr)
-        for line in res_html.stdout.splitlines():
-            if line.strip().endswith('.html'):
-                html_path = line.strip()
-        html_path = os.path.abspath(html_path)
-        self.html_path = html_path
-        logging.info("debug : html_path %s", html_path)
+        finally:
+            pipeline.write_metrics(self.metrics, self.session_folder)
 
         summary_path = os.path.join(self.session_folder, "llm_eval_output/reflexive_summary.html")
         self.summary_path = summary_path
+        self.finish_workflow("LLM evaluation complete!\n\n", results_ready=True)
 
-        self.update_status(
-            f"LLM evaluation complete!\n\n"
-        )
-        self.btn_html.config(state=tk.NORMAL)
-        self.btn_summary.config(state=tk.NORMAL)
-        self.btn_finalize.config(state=tk.NORMAL)
-        self.progress.config(text="")
+    def finish_workflow(self, message, results_ready=False):
+        def inner():
+            self.msg.config(text=message)
+            if results_ready:
+                self.btn_html.config(state=tk.NORMAL)
+                self.btn_summary.config(state=tk.NORMAL)
+            self.btn_finalize.config(state=tk.NORMAL)
+            self.progress.config(text="")
+        self.after(0, inner)
 
     def update_status(self, message):
         def inner():
@@ -187,6 +175,7 @@ class STAR(tk.Tk):
         if not os.path.isfile(path):
             messagebox.showerror("Error", f"HTML file not found:\n{path}")
             return
+        import subprocess
         try:
             if sys.platform == "win32":
                 os.startfile(path)
@@ -212,6 +201,7 @@ if __name__ == "__main__":
             os.makedirs(session_folder)
         session_id = os.path.basename(session_folder)
     else:
+        import random
         randnum = random.randint(1000, 9999)
         dt = datetime.now().strftime("%Y%m%d%H%M%S")
         session_id = f"Session{randnum}_{dt}"
@@ -0,0 +1,128 @@
+import os
+import sys
+import json
+import argparse
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import pipeline
+
+# Cross-session view of the per-stage metrics.json files written by the pipeline.
+#   python Resources/common/starMetrics.py Output/                  p50/p95/p99 per stage
+#   python Resources/common/starMetrics.py Output/ --prometheus     Prometheus text (histograms)
+#   python Resources/common/starMetrics.py Output/ --serve 9464     expose /metrics for scraping
+
+# Histogram bucket upper bounds in seconds; LLM calls on free-tier models can take minutes
+BUCKETS = [0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600]
+
+def load_session_metrics(root):
+    filename = pipeline.metrics_module().METRICS_FILENAME
+    sessions = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+        if filename not in filenames:
+            continue
+        try:
+            with open(os.path.join(dirpath, filename), "r", encoding="utf-8") as f:
+                sessions.append(json.load(f))
+        except (OSError, ValueError):
+            continue
+    return sessions
+
+def stage_samples(sessions):
+    # stage -> list of per-session seconds; "pipeline" holds each run's wall time
+    samples = {}
+    for data in sessions:
+        for stage, entry in data.get("stages", {}).items():
+            samples.setdefault(stage, []).append(entry["seconds"])
+        samples.setdefault("pipeline", []).append(data.get("wall_seconds", 0.0))
+    return samples
+
+def stage_order(samples):
+    stages = pipeline.metrics_module().STAGES
+    return [s for s in stages if s in samples] + sorted(s for s in samples if s not in stages)
+
+def print_report(sessions):
+    samples = stage_samples(sessions)
+    percentile = pipeline.metrics_module().percentile
+    print(f"{len(sessions)} session(s)")
+    print(f"{'stage':<16}{'runs':>6}{'p50 s':>10}{'p95 s':>10}{'p99 s':>10}{'max s':>10}")
+    for stage in stage_order(samples):
+        values = samples[stage]
+        print(f"{stage:<16}{len(values):>6}{percentile(values, 50):>10.3f}{percentile(values, 95):>10.3f}"
+              f"{percentile(values, 99):>10.3f}{max(values):>10.3f}")
+
+def prometheus_text(sessions):
+    samples = stage_samples(sessions)
+    lines = [
+        "# HELP star_stage_duration_seconds Per-session time spent in each pipeline stage",
+        "# TYPE star_stage_duration_seconds histogram",
+    ]
+    for stage in stage_order(samples):
+        values = samples[stage]
+        for bound in BUCKETS:
+            count = sum(1 for v in values if v <= bound)
+            lines.append(f'star_stage_duration_seconds_bucket{{stage="{stage}",le="{bound}"}} {count}')
+        lines.append(f'star_stage_duration_seconds_bucket{{stage="{stage}",le="+Inf"}} {len(values)}')
+        lines.append(f'star_stage_duration_seconds_sum{{stage="{stage}"}} {round(sum(values), 4)}')
+        lines.append(f'star_stage_duration_seconds_count{{stage="{stage}"}} {len(values)}')
+    for metric, field, help_text in (
+        ("star_stage_items_total", "items", "Items processed by each stage across sessions"),
+        ("star_stage_bytes_total", "bytes", "Bytes produced or transferred by each stage across sessions"),
+    ):
+        totals = {}
+        for data in sessions:
+            for stage, entry in data.get("stages", {}).items():
+                totals[stage] = totals.get(stage, 0) + entry.get(field, 0)
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} counter")
+        for stage in stage_order(totals):
+            lines.append(f'{metric}{{stage="{stage}"}} {totals[stage]}')
+    return "\n".join(lines) + "\n"
+
+def serve(root, port):
+    # Metrics are re-read from disk on every scrape, so new sessions show up without a restart
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_response(404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            body = prometheus_text(load_session_metrics(root)).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(("0.0.0.0", port), MetricsHandler)
+    print(f"Serving STAR stage metrics on http://0.0.0.0:{port}/metrics")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+def main():
+    parser = argparse.ArgumentParser(description="Aggregate STAR stage metrics across sessions")
+    parser.add_argument("root", nargs="?", default="Output", help="Tree searched for metrics.json files")
+    parser.add_argument("--prometheus", action="store_true", help="Print Prometheus text format instead of a table")
+    parser.add_argument("--serve", type=int, metavar="PORT", help="Serve Prometheus text on this port at /metrics")
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.root, args.serve)
+        return
+    sessions = load_session_metrics(args.root)
+    if not sessions:
+        print(f"No metrics.json files found under {args.root}")
+        sys.exit(1)
+    if args.prometheus:
+        sys.stdout.write(prometheus_text(sessions))
+    else:
+        print_report(sessions)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+import os
+import json
+import time
+import signal
+import sqlite3
+import argparse
+import logging
+import datetime
+from concurrent.futures import ProcessPoolExecutor
+
+import pipeline
+from pipeline import FINALIZED_MARKER
+from starBatch import SESSION_INPUT_NAME, process_session, session_folder_of
+
+# Watch-folder service: polls the Output/ tree for finalized sessions, queues them in a
+# persistent SQLite queue and evaluates them (LLM, Jira push, HTML) on a bounded process pool.
+#   python Resources/common/starWatch.py --root Output --workers 2
+#   python Resources/common/starWatch.py --root Output --status
+
+def utc_now():
+    return datetime.datetime.utcnow().isoformat(timespec="seconds") + "Z"
+
+class JobQueue:
+    def __init__(self, db_path):
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " input_path TEXT PRIMARY KEY,"
+            " input_mtime_ns INTEGER NOT NULL,"
+            " state TEXT NOT NULL,"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " enqueued_at TEXT, started_at TEXT, finished_at TEXT,"
+            " seconds REAL, cards INTEGER, error TEXT)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, enqueued_at)")
+        # not_before (epoch seconds) holds a failed job back until its retry backoff has passed
+        if "not_before" not in [r[1] for r in self.conn.execute("PRAGMA table_info(jobs)")]:
+            self.conn.execute("ALTER TABLE jobs ADD COLUMN not_before REAL")
+        # Jobs that were running when the service stopped go back to the queue
+        self.conn.execute("UPDATE jobs SET state = 'queued' WHERE state = 'running'")
+        self.conn.commit()
+
+    def known_mtime(self, input_path):
+        row = self.conn.execute("SELECT input_mtime_ns FROM jobs WHERE input_path = ?", (input_path,)).fetchone()
+        return row[0] if row else None
+
+    def enqueue(self, input_path, mtime_ns, state="queued"):
+        self.conn.execute(
+            "INSERT INTO jobs (input_path, input_mtime_ns, state, enqueued_at) VALUES (?, ?, ?, ?)"
+            " ON CONFLICT(input_path) DO UPDATE SET input_mtime_ns = excluded.input_mtime_ns,"
+            " state = excluded.state, enqueued_at = excluded.enqueued_at, error = NULL, not_before = NULL",
+            (input_path, mtime_ns, state, utc_now()),
+        )
+        self.conn.commit()
+
+    def next_queued(self, limit):
+        rows = self.conn.execute(
+            "SELECT input_path FROM jobs WHERE state = 'queued' AND (not_before IS NULL OR not_before <= ?)"
+            " ORDER BY enqueued_at LIMIT ?", (time.time(), limit)
+        ).fetchall()
+        return [r[0] for r in rows]
+
+    def mark_running(self, input_path):
+        self.conn.execute(
+            "UPDATE jobs SET state = 'running', started_at = ?, attempts = attempts + 1 WHERE input_path = ?",
+            (utc_now(), input_path),
+        )
+        self.conn.commit()
+
+    def mark_finished(self, input_path, row, max_attempts, backoff=30.0, max_backoff=900.0):
+        # A failed attempt is retried after backoff * 2^(attempts-1) seconds (capped), so an
+        # outage does not use up every attempt within a few polls
+        attempts = self.conn.execute("SELECT attempts FROM jobs WHERE input_path = ?", (input_path,)).fetchone()[0]
+        not_before = None
+        if row["ok"]:
+            state = "done"
+        elif attempts < max_attempts:
+            state = "queued"
+            not_before = time.time() + min(backoff * 2 ** (attempts - 1), max_backoff)
+        else:
+            state = "failed"
+        self.conn.execute(
+            "UPDATE jobs SET state = ?, finished_at = ?, seconds = ?, cards = ?, error = ?, not_before = ?"
+            " WHERE input_path = ?",
+            (state, utc_now(), row["seconds"], row["cards"], row["error"], not_before, input_path),
+        )
+        self.conn.commit()
+        return state
+
+    def counts(self):
+        counts = {"queued": 0, "running": 0, "done": 0, "failed": 0, "skipped": 0}
+        for state, n in self.conn.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state"):
+            counts[state] = n
+        return counts
+
+    def recent(self, limit=10):
+        rows = self.conn.execute(
+            "SELECT input_path, state, attempts, seconds, cards, error, finished_at FROM jobs"
+            " WHERE finished_at IS NOT NULL ORDER BY finished_at DESC LIMIT ?", (limit,)
+        ).fetchall()
+        keys = ["input_path", "state", "attempts", "seconds", "cards", "error", "finished_at"]
+        return [dict(zip(keys, r)) for r in rows]
+
+def finalized_inputs(root, settle_seconds):
+    # Yields (input_path, mtime_ns) for sessions that are ready to evaluate
+    now = time.time()
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+        if SESSION_INPUT_NAME not in filenames:
+            continue
+        input_path = os.path.abspath(os.path.join(dirpath, SESSION_INPUT_NAME))
+        try:
+            st = os.stat(input_path)
+        except OSError:
+            continue
+        marker_path = os.path.join(dirpath, FINALIZED_MARKER)
+        if FINALIZED_MARKER in filenames:
+            try:
+                with open(marker_path, "r", encoding="utf-8") as f:
+                    marker = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if marker.get("evaluated_in_process"):
+                continue  # the launcher that hosted the workshop evaluates it itself
+            if os.stat(marker_path).st_mtime_ns < st.st_mtime_ns:
+                continue  # session reopened after finalizing; wait for the next marker
+            yield input_path, st.st_mtime_ns
+        elif settle_seconds and now - st.st_mtime > settle_seconds:
+            yield input_path, st.st_mtime_ns
+
+def has_current_output(input_path):
+    result_path = pipeline.result_json_path(session_folder_of(input_path))
+    return os.path.exists(result_path) and os.path.getmtime(result_path) >= os.path.getmtime(input_path)
+
+class WatchService:
+    def __init__(self, args):
+        self.args = args
+        self.root = os.path.abspath(args.root)
+        self.queue = JobQueue(args.db or os.path.join(self.root, ".star_watch.sqlite"))
+        self.status_path = args.status_file or os.path.join(self.root, ".star_watch_status.json")
+        self.max_in_flight = args.max_in_flight or args.workers * 2
+        self.in_flight = {}
+        self.feedback = None
+        self.feedback_at = 0.0
+        self.backpressure = False
+        self.stopping = False
+        self.last_scan = None
+
+    def scan(self):
+        # Backpressure: stop admitting new sessions while the backlog is full; they are
+        # picked up by a later scan because nothing is recorded for them yet
+        counts = self.queue.counts()
+        backlog = counts["queued"]
+        self.backpressure = backlog >= self.args.max_queued
+        if self.backpressure:
+            return
+        for input_path, mtime_ns in finalized_inputs(self.root, self.args.settle):
+            if self.queue.known_mtime(input_path) == mtime_ns:
+                continue
+            if self.args.skip_existing and self.queue.known_mtime(input_path) is None and has_current_output(input_path):
+                self.queue.enqueue(input_path, mtime_ns, state="skipped")
+                continue
+            logging.info("Queued %s", input_path)
+            self.queue.enqueue(input_path, mtime_ns)
+            backlog += 1
+            if backlog >= self.args.max_queued:
+                self.backpressure = True
+                logging.warning("Backpressure: %s sessions queued, pausing intake", backlog)
+                break
+        self.last_scan = utc_now()
+
+    def current_feedback(self):
+        if self.args.no_feedback:
+            return []
+        if self.feedback is None or time.time() - self.feedback_at > self.args.feedback_ttl:
+            try:
+                self.feedback = pipeline.run_feedback_stage()
+                self.feedback_at = time.time()
+            except Exception:
+                logging.exception("Feedback fetch failed")
+                if self.feedback is None:
+                    raise
+        return self.feedback
+
+    def dispatch(self, pool):
+        free = self.max_in_flight - len(self.in_flight)
+        if free <= 0:
+            return
+        for input_path in self.queue.next_queued(free):
+            try:
+                feedback = self.current_feedback()
+            except Exception:
+                return  # retry on the next tick
+            self.queue.mark_running(input_path)
+            self.in_flight[input_path] = pool.submit(process_session, input_path, feedback, no_jira=self.args.no_jira)
+            logging.info("Started %s", input_path)
+
+    def collect(self):
+        for input_path, future in list(self.in_flight.items()):
+            if not future.done():
+                continue
+            del self.in_flight[input_path]
+            try:
+                row = future.result()
+            except Exception as e:
+                row = {"ok": False, "seconds": 0.0, "cards": 0, "error": f"worker crashed: {e}"}
+            state = self.queue.mark_finished(input_path, row, self.args.max_attempts,
+                                             self.args.retry_backoff, self.args.max_retry_backoff)
+            logging.info("Finished %s: %s (%.2fs) %s", input_path, state, row["seconds"], row["error"])
+
+    def write_status(self):
+        status = {
+            "updated_at": utc_now(),
+            "root": self.root,
+            "pid": os.getpid(),
+            "workers": self.args.workers,
+            "last_scan": self.last_scan,
+            "backpressure": self.backpressure,
+            "counts": self.queue.counts(),
+            "in_flight": sorted(self.in_flight),
+            "recent": self.queue.recent(),
+        }
+        tmp_path = self.status_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(status, f, indent=2)
+        os.replace(tmp_path, self.status_path)
+
+    def stop(self, *_):
+        logging.info("Stopping after in-flight sessions finish...")
+        self.stopping = True
+
+    def run(self):
+        signal.signal(signal.SIGINT, self.stop)
+        signal.signal(signal.SIGTERM, self.stop)
+        logging.info("Watching %s with %s worker(s)", self.root, self.args.workers)
+        with ProcessPoolExecutor(max_workers=self.args.workers) as pool:
+            while not self.stopping or self.in_flight:
+                self.collect()
+                if not self.stopping:
+                    self.scan()
+                    self.dispatch(pool)
+                self.write_status()
+                if self.args.once and not self.in_flight and not self.queue.counts()["queued"]:
+                    break
+                time.sleep(self.args.interval)
+        self.write_status()
+
+def print_status(args):
+    root = os.path.abspath(args.root)
+    queue = JobQueue(args.db or os.path.join(root, ".star_watch.sqlite"))
+    print(json.dumps({"counts": queue.counts(), "recent": queue.recent(args.recent)}, indent=2))
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate finalized STAR sessions automatically")
+    parser.add_argument("--root", default="Output", help="Tree watched for Session*/consolidated_reasoning.json")
+    parser.add_argument("--workers", type=int, default=2, help="Sessions evaluated in parallel")
+    parser.add_argument("--interval", type=float, default=5.0, help="Seconds between polls")
+    parser.add_argument("--max-in-flight", type=int, default=0, help="Sessions handed to the pool at once (default 2x workers)")
+    parser.add_argument("--max-queued", type=int, default=200, help="Queued sessions before intake pauses")
+    parser.add_argument("--max-attempts", type=int, default=3, help="Attempts per session before it is marked failed")
+    parser.add_argument("--retry-backoff", type=float, default=30.0, help="Seconds before the first retry of a failed session; doubles per attempt")
+    parser.add_argument("--max-retry-backoff", type=float, default=900.0, help="Upper bound on the retry delay in seconds")
+    parser.add_argument("--settle", type=float, default=0, help="Also accept unmarked sessions unchanged for this many seconds")
+    parser.add_argument("--feedback-ttl", type=float, default=300, help="Seconds a fetched feedback snapshot is reused")
+    parser.add_argument("--reprocess-existing", dest="skip_existing", action="store_false",
+                        help="Also evaluate sessions that already have up-to-date decision cards")
+    parser.add_argument("--no-feedback", action="store_true", help="Do not fetch reflexive feedback")
+    parser.add_argument("--no-jira", action="store_true", help="Do not push results to Jira")
+    parser.add_argument("--once", action="store_true", help="Drain the current backlog and exit")
+    parser.add_argument("--db", help="Queue database (default <root>/.star_watch.sqlite)")
+    parser.add_argument("--status-file", help="Status JSON (default <root>/.star_watch_status.json)")
+    parser.add_argument("--status", action="store_true", help="Print queue status and exit")
+    parser.add_argument("--recent", type=int, default=10, help="Finished jobs listed by --status")
+    args = parser.parse_args()
+
+    os.makedirs(args.root, exist_ok=True)
+    if args.status:
+        print_status(args)
+        return
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    WatchService(args).run()
+
+if __name__ == "__main__":
+    main()
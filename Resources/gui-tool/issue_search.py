@@ -0,0 +1,80 @@
+import re
+from bisect import bisect_left
+
+# In-memory type-ahead index over the loaded Jira export. Every issue contributes the words of its
+# key, summary and module as terms ("JIRA-1437" -> "jira", "1437"). The terms sit in one sorted
+# array, so a prefix is a bisect range (O(log n) to find); submitted issues are switched off in
+# place, which is O(1).
+
+TOKEN_RE = re.compile(r"[0-9a-z]+")
+
+def tokenize(text):
+    return TOKEN_RE.findall(str(text or "").lower())
+
+class IssueIndex:
+    def __init__(self, rows, fields=("issue_key", "summary", "custom_field_module")):
+        # rows: {issue_key: row}
+        self.keys = sorted(rows)
+        self.key_ids = {key: i for i, key in enumerate(self.keys)}
+        self.key_terms = []
+        pairs = []
+        for i, key in enumerate(self.keys):
+            terms = set()
+            for field in fields:
+                terms.update(tokenize(rows[key].get(field, "")))
+            self.key_terms.append(tuple(terms))
+            pairs.extend((term, i) for term in terms)
+        pairs.sort()
+        self.terms = [t for t, _ in pairs]
+        self.term_keys = [i for _, i in pairs]
+        self.alive = bytearray(b"\x01") * len(self.keys)
+        self.live = len(self.keys)
+
+    def __len__(self):
+        return self.live
+
+    def __contains__(self, key):
+        i = self.key_ids.get(key)
+        return i is not None and self.alive[i] == 1
+
+    def remove(self, key):
+        i = self.key_ids.get(key)
+        if i is not None and self.alive[i]:
+            self.alive[i] = 0
+            self.live -= 1
+
+    def prefix_range(self, prefix):
+        lo = bisect_left(self.terms, prefix)
+        return lo, bisect_left(self.terms, prefix + "\uffff", lo)
+
+    def search(self, query, limit=50):
+        # Issue keys matching every word of query as a prefix of one of their terms. The narrowest
+        # word's range drives the scan; the other words are checked against that issue's terms.
+        words = tokenize(query)
+        if not words:
+            return self.first(limit)
+        ranges = sorted((hi - lo, lo, hi, w) for w in words for lo, hi in [self.prefix_range(w)])
+        _, lo, hi, driver = ranges[0]
+        others = [w for w in words if w != driver]
+        results = []
+        seen = set()
+        for pos in range(lo, hi):
+            i = self.term_keys[pos]
+            if not self.alive[i] or i in seen:
+                continue
+            seen.add(i)
+            terms = self.key_terms[i]
+            if all(any(t.startswith(w) for t in terms) for w in others):
+                results.append(self.keys[i])
+                if len(results) >= limit:
+                    break
+        return results
+
+    def first(self, limit=50):
+        results = []
+        for i, key in enumerate(self.keys):
+            if self.alive[i]:
+                results.append(key)
+                if len(results) >= limit:
+                    break
+        return results
@@ -0,0 +1,84 @@
+import csv
+import sys
+
+# Column store for a loaded Jira CSV export: one list per kept field, one row id per issue key.
+# The header is mapped once, only the requested fields are kept, and values that repeat across
+# issues (reporter, status, module, ...) are interned so every row shares one string object.
+
+INTERNED_FIELDS = ("issue_type", "reporter", "reporter_id", "status", "labels",
+                   "custom_field_stakeholders", "custom_field_module")
+
+class StoryRow:
+    # Read-only view of one issue; quacks like the row dict it replaces
+    __slots__ = ("store", "i")
+
+    def __init__(self, store, i):
+        self.store = store
+        self.i = i
+
+    def get(self, field, default=""):
+        column = self.store.columns.get(field)
+        return default if column is None else column[self.i]
+
+    def __getitem__(self, field):
+        return self.store.columns[field][self.i]
+
+    def to_dict(self):
+        return {field: column[self.i] for field, column in self.store.columns.items()}
+
+class StoryStore:
+    def __init__(self, fields):
+        self.fields = tuple(fields)
+        self.columns = {}
+        self.row_ids = {}
+
+    def __len__(self):
+        return len(self.row_ids)
+
+    def __iter__(self):
+        return iter(self.row_ids)
+
+    def __contains__(self, key):
+        return key in self.row_ids
+
+    def __getitem__(self, key):
+        return StoryRow(self, self.row_ids[key])
+
+    def get(self, key, default=None):
+        i = self.row_ids.get(key)
+        return default if i is None else StoryRow(self, i)
+
+def load_story_csv(path, fields, normalize_header, key_field="issue_key"):
+    # Rows without a key are skipped; a key seen twice keeps its last row, and a header that maps
+    # to the same field twice keeps its last column (as csv.DictReader did)
+    store = StoryStore(fields)
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        positions = {}
+        for pos, name in enumerate(next(reader, [])):
+            field = normalize_header(name)
+            if field in store.fields:
+                positions[field] = pos
+        if key_field not in positions:
+            return store
+        for field in positions:
+            store.columns[field] = []
+        plan = [(store.columns[field], pos, field in INTERNED_FIELDS) for field, pos in positions.items()]
+        key_pos = positions[key_field]
+        row_ids = store.row_ids
+        intern = sys.intern
+        for row in reader:
+            n = len(row)
+            key = row[key_pos] if key_pos < n else ""
+            if not key:
+                continue
+            values = [(intern(row[pos]) if shared else row[pos]) if pos < n else "" for _, pos, shared in plan]
+            i = row_ids.get(key)
+            if i is None:
+                row_ids[key] = len(row_ids)
+                for (column, _, _), value in zip(plan, values):
+                    column.append(value)
+            else:
+                for (column, _, _), value in zip(plan, values):
+                    column[i] = value
+    return store
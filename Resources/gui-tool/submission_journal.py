@@ -0,0 +1,125 @@
+import os
+import json
+import time
+import logging
+import threading
+
+# Append-only journal of workshop submissions, one JSON record per line, next to
+# consolidated_reasoning.json. A submit appends one line instead of rewriting the whole file;
+# finalize compacts the journal into the consolidated JSON, and startup replays whatever a
+# crashed or closed session left behind.
+#   STAR_JOURNAL_FSYNC=always    fsync every record (default)
+#   STAR_JOURNAL_FSYNC=interval  fsync at most every STAR_JOURNAL_FSYNC_INTERVAL seconds (default 1)
+#   STAR_JOURNAL_FSYNC=off       leave it to the OS
+# Every record is flushed to the OS on append, so only a power loss, not an app crash, can lose
+# records written since the last fsync.
+
+FSYNC_MODES = ("always", "interval", "off")
+
+def journal_path(json_path):
+    return os.path.splitext(json_path)[0] + ".journal.jsonl"
+
+def record_id(record):
+    # Identity used to skip journal records that a compaction already wrote out
+    return (record.get("session_id"), record.get("issue_key"), record.get("timestamp"))
+
+def write_json_atomic(json_path, data):
+    # Same layout as before (indent=2), written to a temp file, fsynced and renamed into place
+    output_dir = os.path.dirname(json_path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    tmp_path = json_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, json_path)
+
+class SubmissionJournal:
+    def __init__(self, json_path, fsync=None, fsync_interval=None):
+        self.json_path = json_path
+        self.path = journal_path(json_path)
+        self.fsync = fsync or os.environ.get("STAR_JOURNAL_FSYNC", "always")
+        if self.fsync not in FSYNC_MODES:
+            logging.warning("Unknown STAR_JOURNAL_FSYNC=%s; using 'always'", self.fsync)
+            self.fsync = "always"
+        self.fsync_interval = fsync_interval if fsync_interval is not None else float(os.environ.get("STAR_JOURNAL_FSYNC_INTERVAL", "1"))
+        self.last_fsync = 0.0
+        self.unsynced = False
+        self._file = None
+        self._lock = threading.Lock()
+
+    def recover(self, records):
+        # Returns records plus every journal record they do not already contain. A torn last
+        # line (crash mid-append) is cut off so the next append starts on a clean line.
+        if not os.path.exists(self.path):
+            return records
+        seen = {record_id(r) for r in records}
+        replayed = []
+        good_bytes = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("incomplete line")
+                    record = json.loads(line)
+                except ValueError:
+                    logging.warning("Journal %s: dropping torn record at byte %s", self.path, good_bytes)
+                    break
+                good_bytes += len(line)
+                if record_id(record) not in seen:
+                    seen.add(record_id(record))
+                    replayed.append(record)
+        if good_bytes < os.path.getsize(self.path):
+            with open(self.path, "r+b") as f:
+                f.truncate(good_bytes)
+        if replayed:
+            logging.info("Journal %s: replayed %s record(s) from an unfinished session", self.path, len(replayed))
+        return records + replayed
+
+    def append(self, record):
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(line)
+            self._file.flush()
+            now = time.monotonic()
+            if self.fsync == "always" or (self.fsync == "interval" and now - self.last_fsync >= self.fsync_interval):
+                os.fsync(self._file.fileno())
+                self.last_fsync = now
+                self.unsynced = False
+            else:
+                self.unsynced = self.fsync == "interval"
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                if self.unsynced:
+                    os.fsync(self._file.fileno())
+                    self.unsynced = False
+                self._file.close()
+                self._file = None
+
+    def compact(self, records):
+        # Writes records to the consolidated JSON, then drops the journal. A crash in between
+        # is harmless: recover() skips journal records the consolidated file already holds.
+        self.close()
+        write_json_atomic(self.json_path, records)
+        with self._lock:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+    def compact_in_background(self, records, on_done):
+        # on_done(error) runs on the worker thread; error is None on success
+        def run():
+            try:
+                self.compact(records)
+            except Exception as e:
+                logging.exception("Journal compaction failed")
+                on_done(e)
+                return
+            on_done(None)
+        thread = threading.Thread(target=run, name="journal-compaction", daemon=True)
+        thread.start()
+        return thread
@@ -1,4 +1,3 @@
-import csv
 import json
 import os
 import re
@@ -8,6 +7,14 @@ import tkinter.font
 from tkinter import ttk, messagebox, filedialog, simpledialog
 import sys
 
+from issue_search import IssueIndex
+from story_store import StoryStore, load_story_csv
+from submission_journal import SubmissionJournal, journal_path, write_json_atomic
+
+# The finalize marker name is shared with starWatch through Resources/common/pipeline.py
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+from pipeline import FINALIZED_MARKER
+
 # Field mapping from CSV header to normalized field names
 FIELD_MAPPING = {
     "issue type": "issue_type",
@@ -33,6 +40,14 @@ DETAIL_FIELDS = [
 
 OUTCOME_FIELDS = ["value_agreement", "dissent", "dependencies", "biases"]
 
+# Type-ahead: matches shown in the issue dropdown, and the pause after a keystroke before searching
+SEARCH_RESULTS = 50
+SEARCH_DELAY_MS = 120
+
+# Sessions started before the workshop ran inside starLauncher kept their files in this subfolder;
+# they now live at the session root
+LEGACY_OUTPUT_DIR = "workshop_output"
+
 def normalize_header(header):
     # Normalize, strip, lower, and map via FIELD_MAPPING
     return FIELD_MAPPING.get(header.strip().lower(), header.strip().lower())
@@ -47,11 +62,27 @@ def load_all_json(json_path):
             return []
 
 def save_all_json(json_path, data):
-    output_dir = os.path.dirname(json_path)
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+    write_json_atomic(json_path, data)
+
+def adopt_legacy_output(session_folder, json_path):
+    # Reopening an old session: move its records (and any unfinished journal) up to the session root
+    legacy_folder = os.path.join(session_folder, LEGACY_OUTPUT_DIR)
+    legacy_path = os.path.join(legacy_folder, os.path.basename(json_path))
+    if os.path.exists(json_path) or not os.path.exists(legacy_path):
+        return
+    for src, dst in ((legacy_path, json_path), (journal_path(legacy_path), journal_path(json_path))):
+        if os.path.exists(src):
+            os.replace(src, dst)
+
+def write_finalized_marker(session_folder, records, evaluated_in_process=False):
+    # evaluated_in_process tells the watch daemon the embedding app (starLauncher) runs the LLM stages itself
+    marker = {
+        "finalized_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "records": len(records),
+        "evaluated_in_process": evaluated_in_process,
+    }
+    with open(os.path.join(session_folder, FINALIZED_MARKER), "w", encoding="utf-8") as f:
+        json.dump(marker, f, indent=2)
 
 def validate_json_schema(data):
     required = DETAIL_FIELDS + OUTCOME_FIELDS + ["session_id", "facilitator_id", "timestamp"]
@@ -95,19 +126,25 @@ class EmailPrompt(tk.Toplevel):
         self.destroy()
 
 class StoryApp:
-    def __init__(self, root, facilitator_id, session_folder):
+    def __init__(self, root, facilitator_id, session_folder, on_finalize=None):
         self.root = root
+        self.on_finalize = on_finalize
         self.root.title("STAR Workshop Tool")
         self.root.configure(bg="#e3eafc")
         self.session_folder = session_folder
         self.session_id = os.path.basename(session_folder)
         self.data_json_path = os.path.join(self.session_folder, "consolidated_reasoning.json")
+        adopt_legacy_output(self.session_folder, self.data_json_path)
         self.facilitator_id = facilitator_id
-        self.csv_data = []
-        self.story_by_key = {}
+        self.story_by_key = StoryStore(DETAIL_FIELDS)
         self.entry_fields = {}
         self.detail_vars = {}
-        self.loaded_json = load_all_json(self.data_json_path)
+        # Submissions go to an append-only journal; replay what an unfinished run left in it
+        self.journal = SubmissionJournal(self.data_json_path)
+        self.loaded_json = self.journal.recover(load_all_json(self.data_json_path))
+        self.submitted_keys = {r.get("issue_key") for r in self.loaded_json if r.get("session_id") == self.session_id}
+        self.issue_index = IssueIndex({})
+        self.search_job = None
         self.setup_styles()
         self.build_layout()
         self.load_csv_dialog()
@@ -148,9 +185,14 @@ class StoryApp:
         issue_frame.pack(fill="x", padx=pad_x, pady=pad_y)
         ttk.Label(issue_frame, text="Jira Issue Key:").grid(row=0, column=0, sticky="w")
         self.jira_key_var = tk.StringVar()
-        self.jira_key_combo = ttk.Combobox(issue_frame, textvariable=self.jira_key_var, state="readonly", width=40)
+        # Editable: typing searches keys, summaries and modules; the dropdown lists the matches
+        self.jira_key_combo = ttk.Combobox(issue_frame, textvariable=self.jira_key_var, width=60)
         self.jira_key_combo.grid(row=0, column=1, sticky="w", padx=8)
         self.jira_key_combo.bind("<<ComboboxSelected>>", self.on_story_selected)
+        self.jira_key_combo.bind("<KeyRelease>", self.schedule_search)
+        self.jira_key_combo.bind("<Return>", self.on_search_return)
+        self.match_label = ttk.Label(issue_frame, text="")
+        self.match_label.grid(row=0, column=2, sticky="w")
 
         autofill_frame = ttk.LabelFrame(self.root, text="2. Story Details", style="Section.TLabelframe", labelanchor="nw", padding=(pad_x, pad_y))
         autofill_frame.pack(fill="x", padx=pad_x, pady=pad_y)
@@ -197,23 +239,54 @@ class StoryApp:
 
     def load_csv(self, path):
         try:
-            with open(path, newline='', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                self.csv_data = [
-                    {normalize_header(k): v for k, v in row.items()}
-                    for row in reader
-                ]
-            self.story_by_key = {row.get("issue_key"): row for row in self.csv_data if row.get("issue_key")}
-            keys = sorted(self.story_by_key.keys())
-            self.jira_key_combo['values'] = keys
+            # Only DETAIL_FIELDS are kept, column by column (see story_store.py)
+            self.story_by_key = load_story_csv(path, DETAIL_FIELDS, normalize_header)
+            self.issue_index = IssueIndex(self.story_by_key)
+            for key in self.submitted_keys:
+                self.issue_index.remove(key)
             self.jira_key_var.set("")
+            self.refresh_matches()
             self.reset_details_and_inputs()
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load CSV:\n{e}")
 
+    def issue_choice(self, key):
+        summary = self.story_by_key.get(key, {}).get("summary", "")
+        return f"{key}  {summary[:70]}" if summary else key
+
+    def selected_key(self):
+        # The combobox shows "KEY  summary"; only the key is used
+        text = self.jira_key_var.get().strip()
+        key = text.split()[0] if text else ""
+        return key if key in self.issue_index else ""
+
+    def refresh_matches(self):
+        self.search_job = None
+        matches = self.issue_index.search(self.jira_key_var.get(), limit=SEARCH_RESULTS)
+        self.jira_key_combo['values'] = [self.issue_choice(k) for k in matches]
+        self.match_label.configure(text=f"{len(self.issue_index)} open")
+
+    def schedule_search(self, event=None):
+        if event is not None and event.keysym in ("Up", "Down", "Return", "Escape", "Tab"):
+            return
+        if self.search_job is not None:
+            self.root.after_cancel(self.search_job)
+        self.search_job = self.root.after(SEARCH_DELAY_MS, self.refresh_matches)
+
+    def on_search_return(self, event=None):
+        # Enter picks the typed key, or the only match
+        if not self.selected_key():
+            matches = self.issue_index.search(self.jira_key_var.get(), limit=2)
+            if len(matches) != 1:
+                return
+            self.jira_key_var.set(matches[0])
+        self.on_story_selected()
+
     def on_story_selected(self, event=None):
-        key = self.jira_key_var.get()
+        key = self.selected_key()
         row = self.story_by_key.get(key)
+        if row:
+            self.jira_key_var.set(key)
         if not row:
             self.reset_details_and_inputs()
             self.disable_all_except_jira_key()
@@ -255,14 +328,14 @@ class StoryApp:
         self.disable_all_except_jira_key()
 
     def submit_story(self):
-        key = self.jira_key_var.get()
+        typed = self.jira_key_var.get().split()
+        if typed and typed[0] in self.submitted_keys:
+            messagebox.showerror("Duplicate", f"Jira Issue {typed[0]} has already been entered in this session.")
+            return
+        key = self.selected_key()
         if not key:
             messagebox.showwarning("Missing", "Please select a Jira Issue Key.")
             return
-        existing = [r for r in self.loaded_json if r.get("issue_key") == key and r.get("session_id") == self.session_id]
-        if existing:
-            messagebox.showerror("Duplicate", f"Jira Issue {key} has already been entered in this session.")
-            return
         row = self.story_by_key.get(key, {})
         record = {}
         for field in DETAIL_FIELDS:
@@ -276,24 +349,86 @@ class StoryApp:
         # Facilitation outcome entries
         for k in OUTCOME_FIELDS:
             record[k] = self.entry_fields[k][0].get()
+        try:
+            self.journal.append(record)
+        except OSError as e:
+            messagebox.showerror("Save Error", f"Could not save Jira Issue {key}:\n{e}")
+            return
         self.loaded_json.append(record)
-        save_all_json(self.data_json_path, self.loaded_json)
+        self.submitted_keys.add(key)
         messagebox.showinfo("Saved", f"Data for Jira Issue {key} has been saved.")
 
-        keys_left = [v for v in self.jira_key_combo['values'] if v != key]
-        self.jira_key_combo['values'] = keys_left
+        self.issue_index.remove(key)
         self.jira_key_var.set("")
+        self.refresh_matches()
         self.reset_details_and_inputs()
-        if not keys_left:
+        if not len(self.issue_index):
             self.submit_btn.configure(state="disabled")
 
     def finalize_and_quit(self):
         try:
             validate_json_schema(self.loaded_json)
-            print(self.data_json_path)
-            self.root.quit()
         except Exception as e:
             messagebox.showerror("Validation Error", f"Could not finalize session:\n{e}")
+            return
+        # The journal is compacted into consolidated_reasoning.json off the UI thread; the marker
+        # is only written once the consolidated file is complete
+        self.submit_state = self.submit_btn["state"]
+        self.finalize_btn.configure(state="disabled")
+        self.submit_btn.configure(state="disabled")
+        records = list(self.loaded_json)
+        self.journal.compact_in_background(records, lambda error: self.root.after(0, self.on_compacted, error))
+
+    def on_compacted(self, error):
+        if error is not None:
+            messagebox.showerror("Save Error", f"Could not write {self.data_json_path}:\n{error}")
+            self.finalize_btn.configure(state="normal")
+            self.submit_btn.configure(state=self.submit_state)
+            return
+        write_finalized_marker(self.session_folder, self.loaded_json, evaluated_in_process=self.on_finalize is not None)
+        if self.on_finalize:
+            # Embedded in another Tk app: hand the records over instead of ending its mainloop
+            records = self.loaded_json
+            self.root.destroy()
+            self.on_finalize(records)
+        else:
+            print(self.data_json_path)
+            self.root.quit()
+
+def ask_facilitator_id(root):
+    # Returns a valid facilitator email, or None when the dialog is cancelled
+    while True:
+        dlg = EmailPrompt(root)
+        root.wait_window(dlg)
+        facilitator_id = dlg.result
+        if facilitator_id is None:
+            messagebox.showerror("No Facilitator ID", "Facilitator email is required to start the session.")
+            return None
+        if is_valid_email(facilitator_id):
+            return facilitator_id
+        else:
+            messagebox.showerror("Invalid Email", "Please enter a valid email address as Facilitator ID.")
+
+def open_workshop(master, session_folder, on_finalize):
+    # Run the workshop as a Toplevel of an existing Tk app (must be called on its main thread).
+    # on_finalize receives the validated records, or None if the facilitator cancels.
+    os.makedirs(session_folder, exist_ok=True)
+    facilitator_id = ask_facilitator_id(master)
+    if facilitator_id is None:
+        on_finalize(None)
+        return None
+    window = tk.Toplevel(master)
+    app = None
+
+    def on_close():
+        if app is not None:
+            app.journal.close()
+        window.destroy()
+        on_finalize(None)
+
+    window.protocol("WM_DELETE_WINDOW", on_close)
+    app = StoryApp(window, facilitator_id, session_folder, on_finalize=on_finalize)
+    return app
 
 def main():
     if len(sys.argv) > 1:
@@ -310,22 +445,14 @@ def main():
         os.makedirs(session_folder, exist_ok=True)
     root = tk.Tk()
     root.withdraw()
-    facilitator_id = None
-    while True:
-        dlg = EmailPrompt(root)
-        root.wait_window(dlg)
-        facilitator_id = dlg.result
-        if facilitator_id is None:
-            messagebox.showerror("No Facilitator ID", "Facilitator email is required to start the session.")
-            root.destroy()
-            return
-        if is_valid_email(facilitator_id):
-            break
-        else:
-            messagebox.showerror("Invalid Email", "Please enter a valid email address as Facilitator ID.")
+    facilitator_id = ask_facilitator_id(root)
+    if facilitator_id is None:
+        root.destroy()
+        return
     root.deiconify()
     app = StoryApp(root, facilitator_id, session_folder)
     root.mainloop()
+    app.journal.close()
 
 if __name__ == "__main__":
     main()
@@ -1,10 +1,479 @@
 import sys
 import os
 import json
-import webbrowser
+import hashlib
 import logging
+import itertools
 import traceback
 
+# List fields, REMOVED issue_key (and aliases) everywhere, KEEP ONLY jira_id as main unique key for display
+ALL_FIELDS = [
+    "issue_type",
+    "jira_key", "jira_id",  # Will both resolve to the same value; use jira_id as preferred key
+    "summary",
+    "reporter", "reporter_id",
+    "status",
+    "custom_field_evidencelink",
+    "description",
+    "labels",
+    "custom_field_stakeholders", "stakeholders",
+    "custom_field_module", "module",
+    "session_id", "facilitator_id", "timestamp",
+    "value_agreement", "dissent", "dependencies", "biases",
+    "priority_score", "rationale"
+]
+
+LLM_OUTPUT_FIELDS = {"priority_score", "rationale"}
+
+# Alternative keys a field may arrive under, tried in order
+FIELD_VARIANTS = {
+    "jira_key": ["jira_id"],
+    "custom_field_stakeholders": ["stakeholders"],
+    "custom_field_module": ["module"],
+}
+
+def field_label(key):
+    return key.replace("_", " ").title()
+
+# Field-resolution table, built once: (keys to try, "<div ...>Display Name:</span> " prefix, is LLM field)
+FIELD_TABLE = [
+    (
+        tuple([key] + FIELD_VARIANTS.get(key, [])),
+        f'<div class="field"><span class="{"llmfield" if key in LLM_OUTPUT_FIELDS else "highlight"}">'
+        f'{field_label(key)}:</span> ',
+        key in LLM_OUTPUT_FIELDS,
+    )
+    for key in ALL_FIELDS
+    if key != "issue_key"  # REMOVE issue_key/alias to NOT render at all
+]
+
+HTML_HEAD = """
+    <!DOCTYPE html>
+    <html lang="en">
+    <head>
+        <meta charset="UTF-8">
+        <title>Ranked Feature Decision Cards</title>
+        <style>
+            body { font-family: Arial, sans-serif; background: #f2f2f2; margin: 0; }
+            .container { max-width: 950px; margin: 40px auto; padding: 24px; background: #fff; border-radius: 8px; box-shadow: 0 2px 6px #bbb; }
+            .feature { margin-bottom: 32px; padding-bottom: 16px; border-bottom: 1px solid #e0e0e0; }
+            .feature:last-child { border-bottom: none; }
+            .field { margin: 4px 0; }
+            .highlight { font-weight: bold; color: #1976D2; }
+            .llmfield { font-weight: bold; color: #c2185b; }
+            h2 { margin-top: 0; }
+        </style>
+    </head>
+    <body>
+    <div class="container">
+        <h1>Ranked Feature Decision Cards</h1>
+    """
+
+HTML_TAIL = """
+    </div>
+    </body>
+    </html>
+    """
+
+WRITE_BUFFER_BYTES = 1 << 16
+
+def render_card(idx, card):
+    # One card's HTML fragment
+    return card_heading(idx) + render_card_body(card)
+
+def card_heading(idx):
+    return f'<div class="feature">\n<h2>Feature #{idx}: '
+
+def render_card_body(card):
+    # Everything after the card number, so a cached fragment survives the card moving in the ranking
+    parts = [f'{card.get("summary", "")}</h2>\n']
+    for keys, prefix, is_llm in FIELD_TABLE:
+        value = ""
+        for k in keys:
+            if k in card:
+                value = card[k]
+                break
+        if value == "" and not is_llm:
+            continue
+        if isinstance(value, (list, tuple)):
+            value = ", ".join(str(x) for x in value)
+        parts.append(f"{prefix}{value}</div>\n")
+    parts.append("</div>\n")
+    return "".join(parts)
+
+def iter_cards(path, raw=False):
+    # Yields decision cards one at a time: JSONL line by line, a JSON array through ijson when
+    # it is installed (json.load otherwise), so large inputs are never held in memory twice.
+    # raw=True yields JSONL lines unparsed; render_html only parses the ones it has no fragment for.
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith(".jsonl"):
+            for line in f:
+                if line.strip():
+                    yield line.strip() if raw else json.loads(line)
+            return
+        try:
+            import ijson
+        except ImportError:
+            data = json.load(f)
+            yield from (data if isinstance(data, list) else [data])
+            return
+    with open(path, "rb") as f:
+        yield from ijson.items(f, "item", use_float=True)
+
+# Virtual report: cards are embedded once as compact JSON and only the rows in view are built
+# by the browser, so the page stays responsive with tens of thousands of cards
+VIRTUAL_HTML_HEAD = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="UTF-8">
+<title>Ranked Feature Decision Cards</title>
+<style>
+  body { font-family: Arial, sans-serif; background: #f2f2f2; margin: 0; }
+  .container { max-width: 1200px; margin: 24px auto; padding: 20px 24px; background: #fff; border-radius: 8px; box-shadow: 0 2px 6px #bbb; }
+  h1 { margin: 0 0 12px 0; }
+  .controls { display: flex; flex-wrap: wrap; gap: 8px; align-items: center; margin-bottom: 8px; }
+  .controls label { font-size: 13px; color: #555; }
+  .controls input, .controls select { padding: 4px; font-size: 13px; }
+  #count { margin-left: auto; font-size: 13px; color: #555; }
+  .layout { display: flex; gap: 16px; }
+  #viewport { position: relative; flex: 3; height: 70vh; overflow-y: auto; border: 1px solid #e0e0e0; }
+  #spacer { position: relative; }
+  .row { position: absolute; left: 0; right: 0; height: 36px; box-sizing: border-box; padding: 0 8px; display: flex; align-items: center; gap: 10px; border-bottom: 1px solid #eee; cursor: pointer; font-size: 13px; white-space: nowrap; }
+  .row:hover { background: #f5f9ff; }
+  .row.selected { background: #e3f0fd; }
+  .row span { overflow: hidden; text-overflow: ellipsis; }
+  .c-rank { width: 48px; color: #888; } .c-prio { width: 40px; font-weight: bold; color: #c2185b; }
+  .c-key { width: 100px; color: #1976D2; } .c-sum { flex: 1; } .c-mod { width: 120px; } .c-rep { width: 110px; } .c-stk { width: 150px; }
+  #detail { flex: 2; height: 70vh; overflow-y: auto; border: 1px solid #e0e0e0; padding: 12px; font-size: 14px; }
+  .field { margin: 4px 0; }
+  .highlight { font-weight: bold; color: #1976D2; }
+  .llmfield { font-weight: bold; color: #c2185b; }
+</style>
+</head>
+<body>
+<div class="container">
+  <h1>Ranked Feature Decision Cards</h1>
+  <div class="controls">
+    <label>Sort <select id="sort">
+      <option value="rank">Rank</option>
+      <option value="-priority">Priority (high first)</option>
+      <option value="priority">Priority (low first)</option>
+      <option value="module">Module</option>
+      <option value="reporter">Reporter</option>
+      <option value="stakeholders">Stakeholders</option>
+    </select></label>
+    <label>Min priority <input id="minprio" type="number" min="0" max="10" step="1" style="width:56px"></label>
+    <label>Module <select id="module"><option value="">All</option></select></label>
+    <label>Reporter <select id="reporter"><option value="">All</option></select></label>
+    <label>Stakeholders <input id="stakeholders" type="search" placeholder="contains..."></label>
+    <label>Search <input id="search" type="search" placeholder="summary, key, rationale..."></label>
+    <span id="count"></span>
+  </div>
+  <div class="layout">
+    <div id="viewport"><div id="spacer"></div></div>
+    <div id="detail">Select a card to see all fields.</div>
+  </div>
+</div>
+"""
+
+VIRTUAL_HTML_SCRIPT = """
+<script>
+(function () {
+  var ROW_HEIGHT = 36, OVERSCAN = 10;
+  var FIELDS = JSON.parse(document.getElementById("fields").textContent);
+  var cards = JSON.parse(document.getElementById("cards").textContent);
+  function pick(card, keys) {
+    for (var i = 0; i < keys.length; i++) { if (keys[i] in card) return card[keys[i]]; }
+    return "";
+  }
+  function text(v) { return Array.isArray(v) ? v.join(", ") : (v === null || v === undefined ? "" : String(v)); }
+  function esc(v) {
+    return text(v).replace(/[&<>"']/g, function (c) {
+      return {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#39;"}[c];
+    });
+  }
+  // Sort and filter keys are computed once per card, not per keystroke
+  var rows = cards.map(function (card, i) {
+    var p = parseFloat(card.priority_score);
+    var row = {
+      i: i, card: card, rank: i + 1, priority: isNaN(p) ? -1 : p,
+      key: text(pick(card, ["jira_id", "jira_key", "issue_key"])),
+      summary: text(card.summary),
+      module: text(pick(card, ["custom_field_module", "module"])),
+      reporter: text(card.reporter),
+      stakeholders: text(pick(card, ["custom_field_stakeholders", "stakeholders"]))
+    };
+    row.haystack = (row.key + " " + row.summary + " " + text(card.description) + " " + text(card.rationale)).toLowerCase();
+    return row;
+  });
+  var view = rows, selected = -1;
+  var viewport = document.getElementById("viewport"), spacer = document.getElementById("spacer");
+  var detail = document.getElementById("detail"), countEl = document.getElementById("count");
+  var controls = ["sort", "minprio", "module", "reporter", "stakeholders", "search"].reduce(function (m, id) {
+    m[id] = document.getElementById(id); return m;
+  }, {});
+
+  function fillSelect(select, field) {
+    var seen = {};
+    rows.forEach(function (r) { if (r[field]) seen[r[field]] = true; });
+    Object.keys(seen).sort().forEach(function (v) {
+      var o = document.createElement("option"); o.value = v; o.textContent = v; select.appendChild(o);
+    });
+  }
+  fillSelect(controls.module, "module");
+  fillSelect(controls.reporter, "reporter");
+
+  function compare(field, dir) {
+    return function (a, b) {
+      var x = a[field], y = b[field];
+      if (x < y) return -dir;
+      if (x > y) return dir;
+      return a.rank - b.rank;
+    };
+  }
+  function apply() {
+    var minp = parseFloat(controls.minprio.value), mod = controls.module.value, rep = controls.reporter.value;
+    var stk = controls.stakeholders.value.toLowerCase(), q = controls.search.value.toLowerCase();
+    view = rows.filter(function (r) {
+      return (isNaN(minp) || r.priority >= minp) && (!mod || r.module === mod) && (!rep || r.reporter === rep) &&
+        (!stk || r.stakeholders.toLowerCase().indexOf(stk) !== -1) && (!q || r.haystack.indexOf(q) !== -1);
+    });
+    var sort = controls.sort.value, dir = sort.charAt(0) === "-" ? -1 : 1, field = sort.replace("-", "");
+    if (field !== "rank") view.sort(compare(field, dir));
+    spacer.style.height = (view.length * ROW_HEIGHT) + "px";
+    countEl.textContent = view.length + " of " + rows.length + " cards";
+    viewport.scrollTop = 0;
+    draw();
+  }
+  function draw() {
+    var first = Math.max(0, Math.floor(viewport.scrollTop / ROW_HEIGHT) - OVERSCAN);
+    var last = Math.min(view.length, Math.ceil((viewport.scrollTop + viewport.clientHeight) / ROW_HEIGHT) + OVERSCAN);
+    var html = [];
+    for (var n = first; n < last; n++) {
+      var r = view[n];
+      html.push('<div class="row' + (r.i === selected ? " selected" : "") + '" data-i="' + r.i + '" style="top:' + (n * ROW_HEIGHT) + 'px">' +
+        '<span class="c-rank">#' + r.rank + '</span><span class="c-prio">' + esc(r.card.priority_score) + '</span>' +
+        '<span class="c-key">' + esc(r.key) + '</span><span class="c-sum">' + esc(r.summary) + '</span>' +
+        '<span class="c-mod">' + esc(r.module) + '</span><span class="c-rep">' + esc(r.reporter) + '</span>' +
+        '<span class="c-stk">' + esc(r.stakeholders) + '</span></div>');
+    }
+    spacer.innerHTML = html.join("");
+  }
+  function showDetail(i) {
+    var r = rows[i], html = ["<h2>Feature #" + r.rank + ": " + esc(r.summary) + "</h2>"];
+    FIELDS.forEach(function (f) {
+      var v = pick(r.card, f.keys);
+      if (v === "" && !f.llm) return;
+      html.push('<div class="field"><span class="' + (f.llm ? "llmfield" : "highlight") + '">' + esc(f.label) + ':</span> ' + esc(v) + '</div>');
+    });
+    detail.innerHTML = html.join("");
+  }
+
+  var pending = null;
+  function schedule() { if (pending === null) pending = requestAnimationFrame(function () { pending = null; draw(); }); }
+  viewport.addEventListener("scroll", schedule);
+  window.addEventListener("resize", schedule);
+  spacer.addEventListener("click", function (e) {
+    var el = e.target.closest(".row");
+    if (!el) return;
+    selected = parseInt(el.getAttribute("data-i"), 10);
+    showDetail(selected);
+    draw();
+  });
+  var timer = null;
+  Object.keys(controls).forEach(function (id) {
+    controls[id].addEventListener("input", function () { clearTimeout(timer); timer = setTimeout(apply, 80); });
+  });
+  apply();
+})();
+</script>
+</body>
+</html>
+"""
+
+VIRTUAL_REPORT_MIN_CARDS = 1000
+
+def report_mode(decision_cards):
+    # Returns (mode, cards). STAR_REPORT_MODE: "cards" (static list), "virtual" (virtual-scrolling
+    # table) or "auto" (default): virtual from STAR_REPORT_VIRTUAL_MIN cards on. A stream such as
+    # iter_cards is read ahead by at most that many cards, which are then replayed before the rest.
+    mode = os.environ.get("STAR_REPORT_MODE", "auto")
+    if mode != "auto":
+        return mode, decision_cards
+    threshold = int(os.environ.get("STAR_REPORT_VIRTUAL_MIN", str(VIRTUAL_REPORT_MIN_CARDS)))
+    if hasattr(decision_cards, "__len__"):
+        return ("virtual" if len(decision_cards) >= threshold else "cards"), decision_cards
+    remaining = iter(decision_cards)
+    head = list(itertools.islice(remaining, threshold))
+    return ("virtual" if len(head) >= threshold else "cards"), itertools.chain(head, remaining)
+
+def script_json(value):
+    # JSON that is safe inside a <script> element
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).replace("<", "\\u003c")
+
+def parse_card(card):
+    return json.loads(card) if isinstance(card, str) else card
+
+# Changing the field layout invalidates every cached fragment
+FRAGMENT_VERSION = hashlib.sha1(("1" + repr(FIELD_TABLE)).encode("utf-8")).hexdigest()[:16]
+COPY_CHUNK_BYTES = 1 << 20
+
+class FragmentCache:
+    # The previous report is the cache. A manifest next to it records, per card, a hash of the card's
+    # content and where its fragment sits in the file. A rebuild renders only cards whose hash is not
+    # in the manifest; the rest are copied byte for byte, in whole runs while cards keep their place.
+    def __init__(self, output_html):
+        self.manifest_path = output_html + ".fragments.json"
+        self.previous = {}
+        self.old = None
+        self.entries = []
+        self.run = None  # [old_start, old_end, new_start] of fragments still to be copied
+        self.reused = 0
+        self.rendered = 0
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            st = os.stat(output_html)
+            if manifest["version"] == FRAGMENT_VERSION and manifest["size"] == st.st_size and manifest["mtime_ns"] == st.st_mtime_ns:
+                self.previous = {key: (idx, start, body, end) for key, idx, start, body, end in manifest["cards"]}
+                self.old = open(output_html, "rb")
+        except (OSError, ValueError, KeyError, TypeError):
+            self.previous = {}
+
+    @staticmethod
+    def key(card):
+        # Raw JSONL text is hashed as-is; parsed cards by their repr (cheaper than re-serializing)
+        return hashlib.blake2b((card if isinstance(card, str) else repr(card)).encode("utf-8"), digest_size=16).hexdigest()
+
+    def write_card(self, f, idx, card):
+        key = self.key(card)
+        hit = self.previous.get(key)
+        if hit is not None and hit[0] == idx:
+            # Same card in the same place: heading and body are reused as they are
+            _, old_start, old_body, old_end = hit
+            if self.run is None or self.run[1] != old_start:
+                self.flush(f)
+                self.run = [old_start, old_start, f.tell()]
+            start = self.run[2] + (old_start - self.run[0])
+            self.run[1] = old_end
+            self.entries.append((key, idx, start, start + old_body - old_start, start + old_end - old_start))
+            self.reused += 1
+            return
+        self.flush(f)
+        start = f.tell()
+        f.write(card_heading(idx).encode("utf-8"))
+        body = f.tell()
+        if hit is not None:
+            self.copy(f, hit[2], hit[3])
+            self.reused += 1
+        else:
+            f.write(render_card_body(parse_card(card)).encode("utf-8"))
+            self.rendered += 1
+        self.entries.append((key, idx, start, body, f.tell()))
+
+    def copy(self, f, start, end):
+        self.old.seek(start)
+        while start < end:
+            chunk = self.old.read(min(COPY_CHUNK_BYTES, end - start))
+            if not chunk:
+                raise OSError("previous report changed during the rebuild")
+            f.write(chunk)
+            start += len(chunk)
+
+    def flush(self, f):
+        if self.run is not None:
+            self.copy(f, self.run[0], self.run[1])
+            self.run = None
+
+    def close(self):
+        if self.old is not None:
+            self.old.close()
+
+    def save(self, output_html):
+        st = os.stat(output_html)
+        manifest = {"version": FRAGMENT_VERSION, "size": st.st_size, "mtime_ns": st.st_mtime_ns, "cards": self.entries}
+        tmp = self.manifest_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(json.dumps(manifest, separators=(",", ":")))
+        os.replace(tmp, self.manifest_path)
+        logging.info("Fragment cache: %s card(s) reused, %s rendered", self.reused, self.rendered)
+
+def fragment_cache(output_html):
+    # STAR_HTML_FRAGMENT_CACHE=0 renders every card from scratch
+    if os.environ.get("STAR_HTML_FRAGMENT_CACHE", "1") == "0":
+        return None
+    return FragmentCache(output_html)
+
+def write_card_report(f, decision_cards, cache=None):
+    # Static report into a binary file; returns the number of cards written
+    f.write(HTML_HEAD.encode("utf-8"))
+    count = 0
+    for count, card in enumerate(decision_cards, 1):
+        if cache is not None:
+            cache.write_card(f, count, card)
+        else:
+            f.write(render_card(count, parse_card(card)).encode("utf-8"))
+    if cache is not None:
+        cache.flush(f)
+    f.write(HTML_TAIL.encode("utf-8"))
+    return count
+
+def write_virtual_report(f, decision_cards):
+    # Returns the number of cards written
+    fields = [{"keys": [key] + FIELD_VARIANTS.get(key, []), "label": field_label(key), "llm": key in LLM_OUTPUT_FIELDS}
+              for key in ALL_FIELDS if key != "issue_key"]
+    f.write(VIRTUAL_HTML_HEAD)
+    f.write(f'<script type="application/json" id="fields">{script_json(fields)}</script>\n')
+    f.write('<script type="application/json" id="cards">[')
+    count = 0
+    for count, card in enumerate(decision_cards, 1):
+        if count > 1:
+            f.write(",\n")
+        f.write(script_json(parse_card(card)))
+    f.write("]</script>")
+    f.write(VIRTUAL_HTML_SCRIPT)
+    return count
+
+def render_html(decision_cards, output_html, mode=None):
+    # Render decision cards (any iterable of dicts, or of raw JSON lines) to output_html and return
+    # its path. Fragments go straight to a buffered temp file that replaces output_html when complete.
+    html_dir = os.path.dirname(output_html)
+    if html_dir:
+        os.makedirs(html_dir, exist_ok=True)
+    if mode is None:
+        mode, decision_cards = report_mode(decision_cards)
+
+    print(f"Writing HTML to {output_html}")
+    logging.info("Writing %s HTML report to %s", mode, output_html)
+    tmp_html = output_html + ".tmp"
+    cache = None
+    if mode == "virtual":
+        with open(tmp_html, "w", encoding="utf-8", buffering=WRITE_BUFFER_BYTES) as f:
+            count = write_virtual_report(f, decision_cards)
+    else:
+        cache = fragment_cache(output_html)
+        try:
+            with open(tmp_html, "wb", buffering=WRITE_BUFFER_BYTES) as f:
+                count = write_card_report(f, decision_cards, cache)
+        finally:
+            if cache is not None:
+                cache.close()
+    os.replace(tmp_html, output_html)
+    if cache is not None:
+        cache.save(output_html)
+
+    print(output_html)
+    logging.info("Successfully wrote HTML file with %s cards: %s", count, output_html)
+    return output_html
+
+def open_in_browser(output_html):
+    import webbrowser
+    try:
+        webbrowser.open('file://' + os.path.realpath(output_html))
+    except Exception as e:
+        print(f"Failed to open HTML in browser: {str(e)}")
+        logging.error(f"Failed to open HTML in browser: {str(e)}")
+
 def main():
     print("displayLatest.py called with args:", sys.argv)
     # Parse arguments and set up paths
@@ -46,103 +515,9 @@ def main():
             logging.error(msg)
             sys.exit(2)
 
-        with open(result_json_filename, "r", encoding="utf-8") as f:
-            decision_cards = json.load(f)
-
-        if isinstance(decision_cards, list):
-            logging.info("Loaded decision cards count: %s", len(decision_cards))
-        else:
-            logging.info("Loaded decision_cards type: %s", type(decision_cards))
-
-        # List fields, REMOVED issue_key (and aliases) everywhere, KEEP ONLY jira_id as main unique key for display
-        all_fields = [
-            "issue_type",
-            "jira_key", "jira_id",  # Will both resolve to the same value; use jira_id as preferred key
-            "summary",
-            "reporter", "reporter_id",
-            "status",
-            "custom_field_evidencelink",
-            "description",
-            "labels",
-            "custom_field_stakeholders", "stakeholders",
-            "custom_field_module", "module",
-            "session_id", "facilitator_id", "timestamp",
-            "value_agreement", "dissent", "dependencies", "biases",
-            "priority_score", "rationale"
-        ]
-
-        llm_output_fields = {"priority_score", "rationale"}
-
-        html = """
-        <!DOCTYPE html>
-        <html lang="en">
-        <head>
-            <meta charset="UTF-8">
-            <title>Ranked Feature Decision Cards</title>
-            <style>
-                body { font-family: Arial, sans-serif; background: #f2f2f2; margin: 0; }
-                .container { max-width: 950px; margin: 40px auto; padding: 24px; background: #fff; border-radius: 8px; box-shadow: 0 2px 6px #bbb; }
-                .feature { margin-bottom: 32px; padding-bottom: 16px; border-bottom: 1px solid #e0e0e0; }
-                .feature:last-child { border-bottom: none; }
-                .field { margin: 4px 0; }
-                .highlight { font-weight: bold; color: #1976D2; }
-                .llmfield { font-weight: bold; color: #c2185b; }
-                h2 { margin-top: 0; }
-            </style>
-        </head>
-        <body>
-        <div class="container">
-            <h1>Ranked Feature Decision Cards</h1>
-        """
-        for idx, card in enumerate(decision_cards, 1):
-            html += f'<div class="feature">\n'
-            html += f'<h2>Feature #{idx}: {card.get("summary", "")}</h2>\n'
-
-            for key in all_fields:
-                # REMOVE issue_key/alias to NOT render at all (just ignore key "issue_key")
-                if key == "issue_key":
-                    continue
-                display_name = key.replace("_", " ").title()
-                variants = [key]
-                if key == "jira_key":
-                    variants += ["jira_id"]
-                if key == "custom_field_stakeholders":
-                    variants += ["stakeholders"]
-                if key == "custom_field_module":
-                    variants += ["module"]
-                value = ""
-                for v in variants:
-                    if v in card:
-                        value = card[v]
-                        break
-                if value == "" and key not in llm_output_fields:
-                    continue
-                if isinstance(value, (list, tuple)):
-                    value = ", ".join(str(x) for x in value)
-                extra_class = "llmfield" if key in llm_output_fields else "highlight"
-                html += f'<div class="field"><span class="{extra_class}">{display_name}:</span> {value}</div>\n'
-            html += '</div>\n'
-
-        html += """
-        </div>
-        </body>
-        </html>
-        """
-
-        print(f"Writing HTML to {output_html}")
-        logging.info("Writing HTML to %s", output_html)
-        with open(output_html, "w", encoding="utf-8") as f:
-            f.write(html)
-
-        print(output_html)
-        logging.info("Successfully wrote HTML file: %s", output_html)
-
-        try:
-            webbrowser.open('file://' + os.path.realpath(output_html))
-        except Exception as e:
-            print(f"Failed to open HTML in browser: {str(e)}")
-            logging.error(f"Failed to open HTML in browser: {str(e)}")
-
+        # Cards are streamed from the input file (.json array or .jsonl) into the page
+        render_html(iter_cards(result_json_filename, raw=True), output_html)
+        open_in_browser(output_html)
     except Exception as exc:
         msg = f"Exception in displayLatest.py: {str(exc)}"
         print(msg)
@@ -0,0 +1,29 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Resources", "LLMadapter"))
+
+from stage_metrics import percentile
+
+class PercentileTest(unittest.TestCase):
+    # Nearest rank over 1..n: the value is its own rank
+    TABLE = [
+        # n, pct, expected
+        (1, 50, 1), (1, 95, 1), (1, 99, 1),
+        (2, 50, 1), (2, 95, 2), (2, 99, 2),
+        (10, 50, 5), (10, 95, 10), (10, 99, 10),
+        (20, 50, 10), (20, 95, 19), (20, 99, 20),
+        (100, 50, 50), (100, 95, 95), (100, 99, 99),
+    ]
+
+    def test_table(self):
+        for n, pct, expected in self.TABLE:
+            with self.subTest(n=n, pct=pct):
+                self.assertEqual(percentile(range(n, 0, -1), pct), expected)
+
+    def test_empty(self):
+        self.assertIsNone(percentile([], 50))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+import io
+import os
+import sys
+import unittest
+import contextlib
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Resources", "common"))
+
+import starMetrics
+
+def sessions(durations):
+    return [{"wall_seconds": d, "stages": {"llm_call": {"seconds": d, "items": 1, "bytes": 10}}} for d in durations]
+
+class StarMetricsReportTest(unittest.TestCase):
+    def report_row(self, durations, stage="llm_call"):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            starMetrics.print_report(sessions(durations))
+        for line in out.getvalue().splitlines():
+            if line.startswith(stage):
+                return [float(v) for v in line.split()[1:]]
+        self.fail(f"no {stage} row")
+
+    def test_report_percentiles(self):
+        # runs, p50, p95, p99, max for 1..n seconds in shuffled order
+        self.assertEqual(self.report_row([2, 1]), [2, 1, 2, 2, 2])
+        self.assertEqual(self.report_row([7, 3, 10, 1, 5, 9, 2, 8, 4, 6]), [10, 5, 10, 10, 10])
+        self.assertEqual(self.report_row(list(range(20, 0, -1))), [20, 10, 19, 20, 20])
+        self.assertEqual(self.report_row(list(range(100, 0, -1))), [100, 50, 95, 99, 100])
+
+    def test_prometheus_buckets(self):
+        text = starMetrics.prometheus_text(sessions([0.05, 0.2, 3, 40]))
+        self.assertIn('star_stage_duration_seconds_bucket{stage="llm_call",le="0.05"} 1', text)
+        self.assertIn('star_stage_duration_seconds_bucket{stage="llm_call",le="0.25"} 2', text)
+        self.assertIn('star_stage_duration_seconds_bucket{stage="llm_call",le="5"} 3', text)
+        self.assertIn('star_stage_duration_seconds_bucket{stage="llm_call",le="+Inf"} 4', text)
+        self.assertIn('star_stage_duration_seconds_count{stage="llm_call"} 4', text)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Resources", "resultsView"))
+from json_to_html import iter_cards, render_html
+
+# Render-time and peak-memory benchmark for the decision-card HTML renderer:
+#   python Utilities/benchRender.py --cards 1000 10000 50000
+#   python Utilities/benchRender.py --cards 10000 --format json
+# "rebuild s" re-renders after re-scoring one card, which the fragment cache mostly serves from disk
+
+def make_card(i):
+    return {
+        "issue_key": f"JIRA-{i}", "jira_id": f"JIRA-{i}", "issue_type": "Story",
+        "summary": f"Feature {i}", "reporter": f"user{i % 17}", "status": "Open",
+        "description": "As a stakeholder I want the feature so that value is delivered. " * 3,
+        "labels": ["star", f"team{i % 5}"], "stakeholders": ["PO", "Ops"], "module": f"Module{i % 9}",
+        "value_agreement": "High", "dissent": "", "dependencies": "", "biases": "",
+        "priority_score": i % 10 + 1, "rationale": "Stand-in rationale " * 5,
+    }
+
+def write_input(path, count, fmt):
+    with open(path, "w", encoding="utf-8") as f:
+        if fmt == "jsonl":
+            for i in range(count):
+                f.write(json.dumps(make_card(i)) + "\n")
+        else:
+            f.write("[")
+            for i in range(count):
+                f.write(("," if i else "") + json.dumps(make_card(i)))
+            f.write("]")
+
+def rescore_one(path, count, fmt):
+    cards = [make_card(i) for i in range(count)]
+    cards[count // 2]["priority_score"] = 99
+    with open(path, "w", encoding="utf-8") as f:
+        if fmt == "jsonl":
+            f.writelines(json.dumps(card) + "\n" for card in cards)
+        else:
+            json.dump(cards, f)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark json_to_html.render_html on generated cards")
+    parser.add_argument("--cards", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--format", choices=["jsonl", "json"], default="jsonl", help="Input file format")
+    args = parser.parse_args()
+
+    print(f"{'cards':>8}{'seconds':>10}{'us/card':>10}{'peak MB':>10}{'html MB':>10}{'rebuild s':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in args.cards:
+            input_path = os.path.join(tmp, f"cards_{count}.{args.format}")
+            output_html = os.path.join(tmp, f"cards_{count}.html")
+            write_input(input_path, count, args.format)
+            tracemalloc.start()
+            started = time.perf_counter()
+            render_html(iter_cards(input_path, raw=True), output_html, mode="cards")
+            elapsed = time.perf_counter() - started
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            rescore_one(input_path, count, args.format)
+            started = time.perf_counter()
+            render_html(iter_cards(input_path, raw=True), output_html, mode="cards")
+            rebuild = time.perf_counter() - started
+            print(f"{count:>8}{elapsed:>10.3f}{elapsed / count * 1e6:>10.1f}{peak / 1e6:>10.2f}"
+                  f"{os.path.getsize(output_html) / 1e6:>10.2f}{rebuild:>11.3f}")
+
+if __name__ == "__main__":
+    main()
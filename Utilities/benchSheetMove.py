@@ -0,0 +1,34 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Resources", "LLMadapter"))
+from sheet_backend import CsvSheetBackend, move_rows
+
+# Offline benchmark of the feedback archive step against the local CSV sheet backend:
+#   python Utilities/benchSheetMove.py --rows 1000
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark move_rows on a local CSV sheet backend")
+    parser.add_argument("--rows", type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        backend = CsvSheetBackend(tmp)
+        header = ["issue_key", "priority", "deviation", "post_release_feedback"]
+        rows = [[f"JIRA-{i}", str(i % 10), "none", "ok"] for i in range(args.rows)]
+        backend.append_rows("Sheet1", [header] + rows)
+        backend.append_rows("Sheet2", [header])
+        backend.calls = 0
+
+        started = time.perf_counter()
+        moved = move_rows(backend, "Sheet1", "Sheet2")
+        elapsed = time.perf_counter() - started
+
+        print(f"Moved {moved} rows in {elapsed * 1000:.1f} ms using {backend.calls} backend calls")
+        print(f"Source rows left: {len(backend.get_all_values('Sheet1'))}, target rows: {len(backend.get_all_values('Sheet2'))}")
+
+if __name__ == "__main__":
+    main()
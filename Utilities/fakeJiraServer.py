@@ -0,0 +1,105 @@
+import sys
+import json
+import time
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Local stand-in for the Jira REST API, used to exercise the bulk updater offline:
+#   python Utilities/fakeJiraServer.py --port 8089 --throttle-every 10
+#   JIRA_URL=http://127.0.0.1:8089 JIRA_USER=x JIRA_TOKEN=x JIRA_RATIONALE_FIELD=customfield_1 ...
+
+class FakeJiraState:
+    def __init__(self, throttle_every=0, retry_after=1, latency=0.0):
+        self.throttle_every = throttle_every
+        self.retry_after = retry_after
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.throttled = 0
+        self.connections = set()
+        self.issues = {}
+
+class FakeJiraHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so connection reuse is observable
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status, body=b"", headers=None):
+        self.send_response(status)
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def do_PUT(self):
+        state = self.server.state
+        length = int(self.headers.get("Content-Length", "0"))
+        raw = self.rfile.read(length)
+        prefix = "/rest/api/3/issue/"
+        if not self.path.startswith(prefix):
+            self._reply(404, b'{"errorMessages":["Not found"]}')
+            return
+        issue_key = self.path[len(prefix):]
+        with state.lock:
+            state.requests += 1
+            state.connections.add(self.client_address)
+            throttle = state.throttle_every and state.requests % state.throttle_every == 0
+            if throttle:
+                state.throttled += 1
+        if state.latency:
+            time.sleep(state.latency)
+        if throttle:
+            self._reply(429, b'{"errorMessages":["Rate limit exceeded"]}', {"Retry-After": str(state.retry_after)})
+            return
+        try:
+            fields = json.loads(raw)["fields"]
+        except (ValueError, KeyError):
+            self._reply(400, b'{"errorMessages":["Invalid body"]}')
+            return
+        with state.lock:
+            state.issues[issue_key] = fields
+        self._reply(204)
+
+    def do_GET(self):
+        state = self.server.state
+        if self.path == "/_stats":
+            with state.lock:
+                body = json.dumps({
+                    "requests": state.requests,
+                    "throttled": state.throttled,
+                    "connections": len(state.connections),
+                    "issues": len(state.issues),
+                }).encode("utf-8")
+            self._reply(200, body, {"Content-Type": "application/json"})
+        else:
+            self._reply(404)
+
+def start_server(port=0, **kwargs):
+    server = ThreadingHTTPServer(("127.0.0.1", port), FakeJiraHandler)
+    server.state = FakeJiraState(**kwargs)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in Jira server")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--throttle-every", type=int, default=0, help="Return 429 on every Nth request")
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds of artificial latency per request")
+    args = parser.parse_args()
+    server = start_server(args.port, throttle_every=args.throttle_every, retry_after=args.retry_after, latency=args.latency)
+    print(f"Fake Jira listening on http://127.0.0.1:{server.server_address[1]}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+        sys.exit(0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+import sys
+import json
+import time
+import argparse
+import socket
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Local stand-in for the OpenRouter chat completions endpoint. It answers every prompt with one
+# decision card per feature found in the prompt, streamed as SSE when the request asks for it.
+# Faults can be injected to exercise retries, timeouts and the circuit breaker:
+#   python Utilities/fakeOpenRouterServer.py --port 8090
+#   python Utilities/fakeOpenRouterServer.py --port 8090 --fail-first 2 --throttle-every 5 --stall-every 7
+#   OPENROUTER_URL=http://127.0.0.1:8090/api/v1/chat/completions python Resources/LLMadapter/openRouter.py ...
+
+def extract_features(prompt):
+    # Features are sent either as a JSON-lines table or as a JSON array
+    if "Features_TABLE:\n" in prompt:
+        lines = prompt.split("Features_TABLE:\n", 1)[1].splitlines()
+        header = json.loads(lines[0])
+        return [dict(zip(header, json.loads(line))) for line in lines[1:] if line.strip()]
+    if "Features_JSON:\n" in prompt:
+        return json.loads(prompt.split("Features_JSON:\n", 1)[1])
+    return []
+
+def make_content(features, drop_every=0, break_every=0):
+    # JSON array of cards; every Nth card can be left out or emitted as a malformed object
+    parts = []
+    for idx, feature in enumerate(features, 1):
+        if drop_every and idx % drop_every == 0:
+            continue
+        card = dict(feature)
+        card["priority_score"] = 10 - (idx % 10)
+        card["rationale"] = f"Stand-in rationale for {feature.get('issue_key', idx)}"
+        text = json.dumps(card, indent=2)
+        if break_every and idx % break_every == 0:
+            text = text.replace('"rationale":', '"rationale"', 1)
+        parts.append(text)
+    return "[\n" + ",\n".join(parts) + "\n]"
+
+class FakeOpenRouterState:
+    def __init__(self, latency=0.0, chunk_size=40, chunk_delay=0.0, drop_every=0, break_every=0, model_latency=None,
+                 fail_first=0, fail_every=0, throttle_every=0, retry_after=1, stall_every=0, stall_seconds=30.0,
+                 cut_every=0, error_every=0, down=False):
+        self.latency = latency
+        self.fail_first = fail_first          # the first N requests get a 503
+        self.fail_every = fail_every          # every Nth request gets a 500
+        self.throttle_every = throttle_every  # every Nth request gets a 429 with Retry-After
+        self.retry_after = retry_after
+        self.stall_every = stall_every        # every Nth request sleeps stall_seconds before answering
+        self.stall_seconds = stall_seconds
+        self.cut_every = cut_every            # every Nth streamed response is cut off halfway
+        self.error_every = error_every        # every Nth streamed response ends in an error chunk halfway
+        self.down = down                      # every request gets a 503
+        self.model_latency = model_latency or {}  # per-model override of latency (hedging tests)
+        self.drop_every = drop_every
+        self.break_every = break_every
+        self.chunk_size = chunk_size
+        self.chunk_delay = chunk_delay
+        self.lock = threading.Lock()
+        self.requests = 0
+
+class FakeOpenRouterHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status, body=b"", headers=None):
+        self.send_response(status)
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def do_POST(self):
+        state = self.server.state
+        length = int(self.headers.get("Content-Length", "0"))
+        try:
+            payload = json.loads(self.rfile.read(length))
+            prompt = payload["messages"][-1]["content"]
+        except (ValueError, KeyError, IndexError):
+            self._reply(400, b'{"error":{"message":"Invalid body"}}')
+            return
+        with state.lock:
+            state.requests += 1
+            n = state.requests
+        if state.down or n <= state.fail_first:
+            self._reply(503, b'{"error":{"code":503,"message":"Injected: provider unavailable"}}')
+            return
+        if state.fail_every and n % state.fail_every == 0:
+            self._reply(500, b'{"error":{"code":500,"message":"Injected: internal error"}}')
+            return
+        if state.throttle_every and n % state.throttle_every == 0:
+            self._reply(429, b'{"error":{"code":429,"message":"Injected: rate limited"}}',
+                        {"Retry-After": str(state.retry_after)})
+            return
+        if state.stall_every and n % state.stall_every == 0:
+            time.sleep(state.stall_seconds)
+        model = payload.get("model", "fake/model")
+        latency = state.model_latency.get(model, state.latency)
+        if latency:
+            time.sleep(latency)
+        content = make_content(extract_features(prompt), state.drop_every, state.break_every)
+        usage = {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(content) // 4,
+                 "total_tokens": (len(prompt) + len(content)) // 4}
+
+        if not payload.get("stream"):
+            body = json.dumps({
+                "id": "fake-completion",
+                "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+                "usage": usage,
+            }).encode("utf-8")
+            self._reply(200, body, {"Content-Type": "application/json"})
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        cut_at = len(content) // 2 if state.cut_every and n % state.cut_every == 0 else None
+        error_at = len(content) // 2 if state.error_every and n % state.error_every == 0 else None
+        try:
+            self.wfile.write(b": OPENROUTER PROCESSING\n\n")
+            for start in range(0, len(content), state.chunk_size):
+                if cut_at is not None and start >= cut_at:
+                    self.connection.shutdown(socket.SHUT_RDWR)  # drop the connection mid-stream
+                    return
+                if error_at is not None and start >= error_at:
+                    # OpenRouter reports provider failures after the 200 as an SSE chunk with "error"
+                    error = {"error": {"code": 502, "message": "Injected: provider error mid-stream"}}
+                    self.wfile.write(f"data: {json.dumps(error)}\n\n".encode("utf-8"))
+                    self.wfile.flush()
+                    return
+                chunk = {"id": "fake-completion", "model": model,
+                         "choices": [{"index": 0, "delta": {"content": content[start:start + state.chunk_size]}}]}
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+                if state.chunk_delay:
+                    time.sleep(state.chunk_delay)
+            # Like OpenRouter, the usage block rides on a final chunk with no content
+            final = {"id": "fake-completion", "model": model, "choices": [{"index": 0, "delta": {}}], "usage": usage}
+            self.wfile.write(f"data: {json.dumps(final)}\n\n".encode("utf-8"))
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError, OSError):
+            pass  # the client abandoned the stream (e.g. a cancelled hedge)
+
+def start_server(port=0, **kwargs):
+    server = ThreadingHTTPServer(("127.0.0.1", port), FakeOpenRouterHandler)
+    server.state = FakeOpenRouterState(**kwargs)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in OpenRouter server")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds before the response starts")
+    parser.add_argument("--chunk-size", type=int, default=40, help="Characters per streamed chunk")
+    parser.add_argument("--chunk-delay", type=float, default=0.0, help="Seconds between streamed chunks")
+    parser.add_argument("--drop-every", type=int, default=0, help="Leave out every Nth card")
+    parser.add_argument("--break-every", type=int, default=0, help="Emit every Nth card as malformed JSON")
+    parser.add_argument("--model-latency", action="append", default=[], metavar="MODEL=SECONDS",
+                        help="Latency for one model, overriding --latency (repeatable)")
+    parser.add_argument("--fail-first", type=int, default=0, help="Answer the first N requests with 503")
+    parser.add_argument("--fail-every", type=int, default=0, help="Answer every Nth request with 500")
+    parser.add_argument("--throttle-every", type=int, default=0, help="Answer every Nth request with 429")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds sent with 429s")
+    parser.add_argument("--stall-every", type=int, default=0, help="Stall every Nth request before answering")
+    parser.add_argument("--stall-seconds", type=float, default=30.0, help="How long a stalled request waits")
+    parser.add_argument("--cut-every", type=int, default=0, help="Cut every Nth streamed response off halfway")
+    parser.add_argument("--error-every", type=int, default=0, help="End every Nth streamed response with an error chunk")
+    parser.add_argument("--down", action="store_true", help="Answer every request with 503")
+    args = parser.parse_args()
+    model_latency = {m: float(s) for m, s in (item.rsplit("=", 1) for item in args.model_latency)}
+    server = start_server(args.port, latency=args.latency, chunk_size=args.chunk_size, chunk_delay=args.chunk_delay,
+                          drop_every=args.drop_every, break_every=args.break_every, model_latency=model_latency,
+                          fail_first=args.fail_first, fail_every=args.fail_every, throttle_every=args.throttle_every,
+                          retry_after=args.retry_after, stall_every=args.stall_every, stall_seconds=args.stall_seconds,
+                          cut_every=args.cut_every, error_every=args.error_every, down=args.down)
+    print(f"Fake OpenRouter listening on http://127.0.0.1:{server.server_address[1]}/api/v1/chat/completions")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+        sys.exit(0)
+
+if __name__ == "__main__":
+    main()
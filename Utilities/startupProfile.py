@@ -0,0 +1,111 @@
+import os
+import sys
+import argparse
+import statistics
+import subprocess
+import time
+
+# Startup-cost profiling for the STAR entry points.
+#   python Utilities/startupProfile.py --imports        per-module import cost (python -X importtime)
+#   python Utilities/startupProfile.py --bench          cold import time vs. budget, exit 1 if over
+# Each entry point is loaded without running its __main__ block.
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Entry point -> (script path, cold-start budget in ms over a bare interpreter)
+ENTRY_POINTS = {
+    "starLauncher": ("Resources/common/starLauncher.py", 100),
+    "workshop-tool": ("Resources/gui-tool/workshop-tool.py", 80),
+    "openRouter": ("Resources/LLMadapter/openRouter.py", 80),
+    "json_to_html": ("Resources/resultsView/json_to_html.py", 50),
+}
+
+def loader_code(script):
+    path = os.path.join(REPO_DIR, script)
+    return (
+        "import sys, runpy; "
+        f"sys.path.insert(0, {os.path.dirname(path)!r}); "
+        f"runpy.run_path({path!r}, run_name='__startup_profile__')"
+    )
+
+def parse_importtime(stderr):
+    # Lines look like: "import time:  self [us] | cumulative | imported package"
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|")
+            rows.append((int(self_us), int(cumulative_us), name.rstrip()))
+        except ValueError:
+            continue
+    return rows
+
+def profile_imports(name, script, top):
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", loader_code(script)],
+        capture_output=True, text=True, cwd=REPO_DIR
+    )
+    rows = parse_importtime(proc.stderr)
+    # Top-level imports (no leading indentation) are what the entry point itself pulls in
+    top_level = [r for r in rows if not r[2].startswith("  ")]
+    total_ms = sum(r[1] for r in top_level) / 1000
+    print(f"\n== {name} ({script}) total import time {total_ms:.1f} ms ==")
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for self_us, cumulative_us, module in sorted(top_level, key=lambda r: r[1], reverse=True)[:top]:
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {module.strip()}")
+    if proc.returncode != 0:
+        print(f"  (load failed: {proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else proc.returncode})")
+
+def time_command(args, runs):
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        proc = subprocess.run(args, capture_output=True, text=True, cwd=REPO_DIR)
+        samples.append((time.perf_counter() - started) * 1000)
+        if proc.returncode != 0:
+            raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f"exit {proc.returncode}")
+    return statistics.median(samples)
+
+def bench(names, runs, scale):
+    # Baseline includes the loader's own runpy import so budgets cover only the entry point
+    baseline = time_command([sys.executable, "-c", "import sys, runpy"], runs)
+    print(f"Bare interpreter + loader: {baseline:.1f} ms (median of {runs})")
+    print(f"{'entry point':<16}{'startup ms':>12}{'budget ms':>11}  result")
+    failed = False
+    for name in names:
+        script, budget = ENTRY_POINTS[name]
+        budget *= scale
+        try:
+            startup = time_command([sys.executable, "-c", loader_code(script)], runs) - baseline
+        except RuntimeError as e:
+            print(f"{name:<16}{'-':>12}{budget:>11.0f}  ERROR {e}")
+            failed = True
+            continue
+        ok = startup <= budget
+        failed = failed or not ok
+        print(f"{name:<16}{startup:>12.1f}{budget:>11.0f}  {'ok' if ok else 'OVER BUDGET'}")
+    return 1 if failed else 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile STAR entry point startup cost")
+    parser.add_argument("--imports", action="store_true", help="Report per-module import cost")
+    parser.add_argument("--bench", action="store_true", help="Benchmark cold startup against budgets")
+    parser.add_argument("--entry", action="append", choices=sorted(ENTRY_POINTS), help="Limit to these entry points")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per entry point for --bench")
+    parser.add_argument("--top", type=int, default=15, help="Modules listed per entry point for --imports")
+    parser.add_argument("--budget-scale", type=float, default=1.0, help="Multiply every budget (slow machines, CI)")
+    args = parser.parse_args()
+
+    names = args.entry or list(ENTRY_POINTS)
+    if not args.imports and not args.bench:
+        args.imports = args.bench = True
+    if args.imports:
+        for name in names:
+            profile_imports(name, ENTRY_POINTS[name][0], args.top)
+    if args.bench:
+        print()
+        sys.exit(bench(names, args.runs, args.budget_scale))
+
+if __name__ == "__main__":
+    main()
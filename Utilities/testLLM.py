@@ -1,12 +1,17 @@
-import requests
+import os
+import sys
 import json
 import logging
 
+# Outbound calls go through the adapter's shared, pooled HTTP client
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Resources", "LLMadapter"))
+from http_client import get_http_client
+
 # --- Logging Setup ---
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s %(levelname)s %(message)s')
 
 def send_openrouter_request():
-    api_key = api_key
+    api_key = os.environ.get("OPENROUTER_API_KEY")
     site_url = "test"
     site_name = "test"
     url = "https://openrouter.ai/api/v1/chat/completions"
@@ -39,7 +44,8 @@ def send_openrouter_request():
     logging.info("Request Headers: %s", headers)
     logging.info("Request Body: %s", json.dumps(payload, indent=2))
 
-    response = requests.post(url, headers=headers, data=json.dumps(payload))
+    client = get_http_client()
+    response = client.request("POST", url, headers=headers, data=json.dumps(payload), timeout=(10, 120))
 
     logging.info("Response Status Code: %s", response.status_code)
     logging.info("Response Headers: %s", dict(response.headers))
@@ -47,6 +53,7 @@ def send_openrouter_request():
         logging.info("Response Body: %s", json.dumps(response.json(), indent=2))
     except Exception:
         logging.info("Response Body (raw): %s", response.text)
+    logging.info("HTTP client: %s", client.stats())
 
     return response
 